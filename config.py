@@ -104,10 +104,25 @@ SELF_EFFICACY_SCALE = [
 GPT_MODELS = ["gpt-4o"]
 ELEVENLABS_MODEL = "eleven_multilingual_v2"
 
-# GPT 피드백 토큰 제한 설정
-GPT_FEEDBACK_MAX_TOKENS = 800
+# GPT 피드백 토큰 제한 설정 (한국어 JSON 응답은 약 1.2~1.6k 토큰 - 잘리면 JSON 파싱 실패)
+GPT_FEEDBACK_MAX_TOKENS = 2000
 GPT_FEEDBACK_MAX_CHARS = 1000
 
+# 스트리밍 요청 대기 설정 (초)
+# 첫 요청이 GPT_HEDGE_DELAY 동안 응답 토큰을 하나도 받지 못하면 같은 요청을 한 번 더 보냄 (두 요청 모두 과금)
+# ⚠️ 약 3k 토큰 JSON 프롬프트의 첫 토큰은 꼬리 구간에서 2초를 자주 넘으므로 실측 p95보다 충분히 크게 설정
+GPT_HEDGE_DELAY = 6
+# 요청별로 이 시간 안에 첫 응답 토큰이 오지 않으면 멈춘 스트림으로 보고 실패 처리
+GPT_FIRST_TOKEN_TIMEOUT = 10
+
+# gpt-4o-mini 먼저 요청 → 응답 형식이 불확실할 때만 gpt-4o로 재요청 (비용 절감)
+# ⚠️ 이 설정은 첫 요청 모델만 바꿈 - 재시도 모델은 아래 GPT_FEEDBACK_RETRY_MODEL
+GPT_FEEDBACK_MINI_FIRST = False
+# 첫 gpt-4o 요청이 실패했을 때 재시도에 사용할 모델 (GPT_FEEDBACK_MINI_FIRST가 False일 때)
+# ⚠️ 연구 기간에는 "gpt-4o" 유지 - "gpt-4o-mini"로 바꾸면 재시도한 세션만 다른 모델로 채점됨
+# (세션 데이터의 gpt_model_used 열에 실제 사용 모델이 기록됨)
+GPT_FEEDBACK_RETRY_MODEL = "gpt-4o"
+
 # API 키 설정
 OPENAI_API_KEY = get_secret('OPENAI_API_KEY')
 ELEVENLABS_API_KEY = get_secret('ELEVENLABS_API_KEY')
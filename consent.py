@@ -270,6 +270,9 @@ def save_background_to_session(background_details):
         key = f'self_efficacy_{i}'
         if key in background_details:
             setattr(st.session_state, key, background_details[key])
+    
+    # 자기효능감 평균 캐시 무효화 (data_io.calculate_self_efficacy_average)
+    st.session_state.pop('self_efficacy_avg_cached', None)
 
 
 # ==================== GCS 매핑 파일 동기화 함수들 ====================
@@ -8,9 +8,23 @@ import os
 import csv
 import json
 import zipfile
+import time
+import threading
+import bisect
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 서비스 계정 JSON 파싱에 사용
+except ImportError:
+    orjson = None
+try:
+    from google.cloud import storage  # GCS 업로드용 (모듈 로드 시 한 번만 import)
+    _STORAGE_IMPORT_ERROR = None
+except ImportError as e:
+    storage = None
+    _STORAGE_IMPORT_ERROR = e
 from config import (
     FOLDERS, 
     DATA_RETENTION_DAYS, 
@@ -25,6 +39,82 @@ from config import (
     KST
 )
 
+# 연구용 점수 기본값 (build_session_data에서 누락 필드 보완용)
+DEFAULT_RESEARCH_SCORES = {
+    'accuracy_score': 0.0,
+    'fluency_score': 0.0,
+    'error_rate': 0.0,
+    'word_count': 0,
+    'duration_s': 0.0,
+    'error_count': 0
+}
+
+# 자기효능감 문항 키 (12개, 표시 순서대로)
+_EFFICACY_KEYS = tuple(f'self_efficacy_{i}' for i in range(1, 13))
+
+# 이미 생성 확인된 폴더 (세션 저장마다 반복되는 makedirs stat 호출 방지)
+_ensured_dirs = set()
+
+
+def _ensure_dir(path):
+    """
+    폴더가 없으면 생성 (프로세스 내에서 한 번만 확인)
+    
+    Args:
+        path: 생성할 폴더 경로
+    """
+    path = os.fspath(path)
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+# ZIP deflate 압축 레벨 (GCS에 한 번 올리는 백업이므로 기본값 6보다 CPU를 덜 쓰는 3 사용)
+ZIP_COMPRESSLEVEL = 3
+
+# ZIP 파일 쓰기 버퍼 크기 (1 MiB)
+ZIP_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# GCS 업로드 청크 크기 (8 MiB, 256 KiB의 배수여야 함)
+GCS_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# 이미 압축된 포맷 (ZIP에 다시 deflate해도 크기가 거의 줄지 않음)
+_PRECOMPRESSED_EXTENSIONS = ('.mp3', '.xlsx')
+
+
+def _zip_compress_type(filename):
+    """
+    ZIP 멤버별 압축 방식 선택 (MP3/XLSX는 저장만, 나머지는 deflate)
+    
+    Args:
+        filename: ZIP에 추가할 파일 이름
+        
+    Returns:
+        int: zipfile 압축 상수
+    """
+    if filename.lower().endswith(_PRECOMPRESSED_EXTENSIONS):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _write_bytes(path, data):
+    """
+    메모리에 있는 바이트를 버퍼 계층 없이 파일에 직접 기록
+    
+    Args:
+        path: 저장할 파일 경로
+        data: 기록할 바이트 데이터
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)  # Windows 텍스트 모드 방지
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
 
 def extract_task_completion_check(detailed_feedback):
     """
@@ -87,6 +177,26 @@ def extract_task_completion_check(detailed_feedback):
     
     return result
 
+
+def get_task_completion_check(detailed_feedback):
+    """
+    Task Completion Check 결과를 세션 단위로 캐시해서 반환
+    (CSV 행과 participant_info.txt가 같은 피드백을 두 번 파싱하지 않도록)
+    
+    Args:
+        detailed_feedback: GPT가 생성한 detailed_feedback 텍스트
+        
+    Returns:
+        dict: Task completion 정보 (읽기 전용으로 사용)
+    """
+    cached = st.session_state.get('task_check_cached')
+    if cached is not None and cached[0] == detailed_feedback:
+        return cached[1]
+    
+    result = extract_task_completion_check(detailed_feedback)
+    st.session_state.task_check_cached = (detailed_feedback, result)
+    return result
+
 def save_session_data():
     """
     세션 데이터를 CSV로 저장 + 참고용 엑셀 파일 경로 반환
@@ -111,7 +221,7 @@ def save_session_data():
         
         # 필요한 폴더 생성
         for folder in FOLDERS.values():
-            os.makedirs(folder, exist_ok=True)
+            _ensure_dir(folder)
         
         timestamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")  # 🔥 KST 추가
         session_data = build_session_data(timestamp)
@@ -174,17 +284,14 @@ def build_session_data(timestamp):
     """
     research_scores = getattr(st.session_state, 'research_scores', {})
     
-    # 기본값 설정
-    default_research_scores = {
-        'accuracy_score': 0.0,
-        'fluency_score': 0.0,
-        'error_rate': 0.0,
-        'word_count': 0,
-        'duration_s': 0.0,
-        'error_count': 0
-    }
+    # 반복 참조되는 세션 값은 한 번만 조회
+    feedback = st.session_state.feedback
+    improvement = getattr(st.session_state, 'improvement_assessment', {})
+    gpt_debug_info = st.session_state.gpt_debug_info
+    session_num = getattr(st.session_state, 'session_number', CURRENT_SESSION)
     
-    for key, default_value in default_research_scores.items():
+    # 기본값 설정
+    for key, default_value in DEFAULT_RESEARCH_SCORES.items():
         if key not in research_scores:
             research_scores[key] = default_value
 
@@ -193,15 +300,20 @@ def build_session_data(timestamp):
     transcription_2_word_count = len(st.session_state.transcription_2.split()) if st.session_state.transcription_2 else 0
     
     # Task Completion Check 데이터 추출
-    task_check_data = extract_task_completion_check(st.session_state.feedback.get('detailed_feedback', ''))
+    task_check_data = get_task_completion_check(feedback.get('detailed_feedback', ''))
+    
+    # 🔥 KST 기준 현재 시각 (한 번만 계산)
+    now = datetime.now(KST)
+    now_str = now.strftime("%Y-%m-%d %H:%M:%S")
+    retention_until = (now + timedelta(days=DATA_RETENTION_DAYS)).strftime('%Y-%m-%d')
 
     session_data = {
         # ===== 1. 기본 식별 정보 =====
         'session_id': st.session_state.session_id,
-        'session_number': getattr(st.session_state, 'session_number', CURRENT_SESSION),
+        'session_number': session_num,
         'session_label': getattr(st.session_state, 'session_label', SESSION_LABELS.get(CURRENT_SESSION, "Session 1")),
         'original_nickname': getattr(st.session_state, 'original_nickname', ''),
-        'timestamp': datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),  # 🔥 KST 추가
+        'timestamp': now_str,  # 🔥 KST 추가
         
         # ===== 2. 배경 정보 및 사전 측정 =====
         'learning_duration': getattr(st.session_state, 'learning_duration', ''),  # 한국어 학습 기간 선택지
@@ -244,7 +356,7 @@ def build_session_data(timestamp):
         'transcription_2_word_count': transcription_2_word_count,
         'transcription_word_count_difference': transcription_2_word_count - transcription_1_word_count,  # 개선도 측정용
 
-        'gpt_feedback_json': json.dumps(st.session_state.feedback, ensure_ascii=False),  # GPT가 생성한 전체 피드백 (JSON 원본)
+        'gpt_feedback_json': json.dumps(feedback, ensure_ascii=False),  # GPT가 생성한 전체 피드백 (JSON 원본)
         
         # ===== 4.5. Task Completion Check 데이터 (새로 추가) =====
         'task_check_past_vacation': task_check_data.get('past_vacation_status', 'Unknown'),  # Covered/Partially/Missing
@@ -270,44 +382,44 @@ def build_session_data(timestamp):
         'audio_quality_check_2': get_audio_quality_label(getattr(st.session_state, 'audio_duration_2', 0)),  # 두 번째 녹음 품질 라벨
         
         # ===== 7. 개선도 평가 데이터 =====
-        'improvement_score': getattr(st.session_state, 'improvement_assessment', {}).get('improvement_score', 0),  # 1차→2차 개선도 점수 (1-10점)
-        'improvement_reason': getattr(st.session_state, 'improvement_assessment', {}).get('improvement_reason', ''),  # 개선도 평가 이유
-        'first_attempt_score': getattr(st.session_state, 'improvement_assessment', {}).get('first_attempt_score', 0),  # 1차 시도 평가 점수
-        'second_attempt_score': getattr(st.session_state, 'improvement_assessment', {}).get('second_attempt_score', 0),  # 2차 시도 평가 점수
-        'score_difference': getattr(st.session_state, 'improvement_assessment', {}).get('score_difference', 0),  # 점수 차이 (2차 - 1차)
-        'feedback_application': getattr(st.session_state, 'improvement_assessment', {}).get('feedback_application', ''),  # 피드백 적용도 ("excellent/good/partial/minimal")
-        'specific_improvements': json.dumps(getattr(st.session_state, 'improvement_assessment', {}).get('specific_improvements', []), ensure_ascii=False),  # 구체적 개선사항 목록
-        'remaining_issues': json.dumps(getattr(st.session_state, 'improvement_assessment', {}).get('remaining_issues', []), ensure_ascii=False),  # 남은 과제 목록
-        'overall_assessment': getattr(st.session_state, 'improvement_assessment', {}).get('overall_assessment', ''),  # 전체 평가 요약
-        'improvement_assessment_json': json.dumps(getattr(st.session_state, 'improvement_assessment', {}), ensure_ascii=False),  # 개선도 평가 전체 (JSON)
+        'improvement_score': improvement.get('improvement_score', 0),  # 1차→2차 개선도 점수 (1-10점)
+        'improvement_reason': improvement.get('improvement_reason', ''),  # 개선도 평가 이유
+        'first_attempt_score': improvement.get('first_attempt_score', 0),  # 1차 시도 평가 점수
+        'second_attempt_score': improvement.get('second_attempt_score', 0),  # 2차 시도 평가 점수
+        'score_difference': improvement.get('score_difference', 0),  # 점수 차이 (2차 - 1차)
+        'feedback_application': improvement.get('feedback_application', ''),  # 피드백 적용도 ("excellent/good/partial/minimal")
+        'specific_improvements': json.dumps(improvement.get('specific_improvements', []), ensure_ascii=False),  # 구체적 개선사항 목록
+        'remaining_issues': json.dumps(improvement.get('remaining_issues', []), ensure_ascii=False),  # 남은 과제 목록
+        'overall_assessment': improvement.get('overall_assessment', ''),  # 전체 평가 요약
+        'improvement_assessment_json': json.dumps(improvement, ensure_ascii=False),  # 개선도 평가 전체 (JSON)
         
         # ===== 8. 학생용 피드백 필드들 (UI 표시용) =====
-        'suggested_model_sentence': st.session_state.feedback.get('suggested_model_sentence', ''),  # AI가 제안한 모범 답안 (한국어)
-        'suggested_model_sentence_english': st.session_state.feedback.get('suggested_model_sentence_english', ''),  # 모범 답안 영어 번역
-        'fluency_comment': st.session_state.feedback.get('fluency_comment', ''),  # 유창성 코멘트
-        'interview_readiness_score': st.session_state.feedback.get('interview_readiness_score', ''),  # AI가 평가한 인터뷰 준비도 (1-10점)
-        'interview_readiness_reason': st.session_state.feedback.get('interview_readiness_reason', ''),  # 인터뷰 준비도 점수 이유
-        'grammar_expression_tip': st.session_state.feedback.get('grammar_expression_tip', ''),  # 고급 문법 패턴 제안
+        'suggested_model_sentence': feedback.get('suggested_model_sentence', ''),  # AI가 제안한 모범 답안 (한국어)
+        'suggested_model_sentence_english': feedback.get('suggested_model_sentence_english', ''),  # 모범 답안 영어 번역
+        'fluency_comment': feedback.get('fluency_comment', ''),  # 유창성 코멘트
+        'interview_readiness_score': feedback.get('interview_readiness_score', ''),  # AI가 평가한 인터뷰 준비도 (1-10점)
+        'interview_readiness_reason': feedback.get('interview_readiness_reason', ''),  # 인터뷰 준비도 점수 이유
+        'grammar_expression_tip': feedback.get('grammar_expression_tip', ''),  # 고급 문법 패턴 제안
         
         # ===== 9. STT 루브릭 기반 피드백 분석 =====
-        'grammar_issues_count': len(st.session_state.feedback.get('grammar_issues', [])),  # 발견된 문법 오류 개수
-        'vocabulary_suggestions_count': len(st.session_state.feedback.get('vocabulary_suggestions', [])),  # 어휘 제안 개수
-        'content_expansion_suggestions_count': len(st.session_state.feedback.get('content_expansion_suggestions', [])),  # 내용 확장 제안 개수
-        'content_expansion_suggestions_json': json.dumps(st.session_state.feedback.get('content_expansion_suggestions', []), ensure_ascii=False),  # 내용 확장 제안 상세
-        'grammar_issues_json': json.dumps(st.session_state.feedback.get('grammar_issues', []), ensure_ascii=False),  # 문법 오류 상세 분석
-        'vocabulary_suggestions_json': json.dumps(st.session_state.feedback.get('vocabulary_suggestions', []), ensure_ascii=False),  # 어휘 제안 상세
-        'highlight_targets_json': json.dumps(st.session_state.feedback.get('highlight_targets', {}), ensure_ascii=False),  # 하이라이트 대상 분석
+        'grammar_issues_count': len(feedback.get('grammar_issues', [])),  # 발견된 문법 오류 개수
+        'vocabulary_suggestions_count': len(feedback.get('vocabulary_suggestions', [])),  # 어휘 제안 개수
+        'content_expansion_suggestions_count': len(feedback.get('content_expansion_suggestions', [])),  # 내용 확장 제안 개수
+        'content_expansion_suggestions_json': json.dumps(feedback.get('content_expansion_suggestions', []), ensure_ascii=False),  # 내용 확장 제안 상세
+        'grammar_issues_json': json.dumps(feedback.get('grammar_issues', []), ensure_ascii=False),  # 문법 오류 상세 분석
+        'vocabulary_suggestions_json': json.dumps(feedback.get('vocabulary_suggestions', []), ensure_ascii=False),  # 어휘 제안 상세
+        'highlight_targets_json': json.dumps(feedback.get('highlight_targets', {}), ensure_ascii=False),  # 하이라이트 대상 분석
         
         # ===== 10. 디버그 및 시스템 정보 =====
-        'gpt_model_used': st.session_state.gpt_debug_info.get('model_used', ''),  # 사용된 GPT 모델명
-        'gpt_attempts': st.session_state.gpt_debug_info.get('attempts', 0),  # GPT API 시도 횟수
-        'dual_evaluation_used': st.session_state.gpt_debug_info.get('dual_evaluation', False),  # 이중 평가 시스템 사용 여부
+        'gpt_model_used': gpt_debug_info.get('model_used', ''),  # 사용된 GPT 모델명
+        'gpt_attempts': gpt_debug_info.get('attempts', 0),  # GPT API 시도 횟수
+        'dual_evaluation_used': gpt_debug_info.get('dual_evaluation', False),  # 이중 평가 시스템 사용 여부
         
         # ===== 11. 파일 관리 정보 ===== (맨 아래쪽)
-        'audio_folder': f"{FOLDERS['audio_recordings']}/{getattr(st.session_state, 'session_number', CURRENT_SESSION)}_{st.session_state.session_id}_{timestamp}",
-        'data_retention_until': (datetime.now(KST) + timedelta(days=DATA_RETENTION_DAYS)).strftime('%Y-%m-%d'),  # 🔥 KST 추가
+        'audio_folder': f"{FOLDERS['audio_recordings']}/{session_num}_{st.session_state.session_id}_{timestamp}",
+        'data_retention_until': retention_until,  # 🔥 KST 추가
         'deletion_requested': False,
-        'last_updated': datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),  # 🔥 KST 추가
+        'last_updated': now_str,  # 🔥 KST 추가
         'saved_at_step': 'second_recording_complete',
         'save_trigger': 'auto_after_second_recording'
     }
@@ -334,22 +446,35 @@ def get_audio_quality_label(duration):
         return 'very_short'
 
 
-def calculate_self_efficacy_average():
+def _compute_self_efficacy_average():
     """
-    자기효능감 평균 계산
+    자기효능감 평균 실제 계산 (1-5 범위의 유효 응답만 포함)
     
     Returns:
         float: 자기효능감 평균 (1-5점)
     """
-    efficacy_scores = []
-    for i in range(1, 13):
-        score = getattr(st.session_state, f'self_efficacy_{i}', 0)
-        if score and isinstance(score, (int, float)) and 1 <= score <= 5:
-            efficacy_scores.append(score)
-    
+    efficacy_scores = [
+        score for score in (st.session_state.get(key, 0) for key in _EFFICACY_KEYS)
+        if isinstance(score, (int, float)) and 1 <= score <= 5
+    ]
     return round(sum(efficacy_scores) / len(efficacy_scores), 2) if efficacy_scores else 0
 
 
+def calculate_self_efficacy_average():
+    """
+    자기효능감 평균 계산 (세션 단위 캐시)
+    
+    배경 정보 저장 시(consent.save_background_to_session) 캐시가 무효화되므로
+    같은 세션 안에서 반복 호출해도 한 번만 계산합니다.
+    
+    Returns:
+        float: 자기효능감 평균 (1-5점)
+    """
+    if 'self_efficacy_avg_cached' not in st.session_state:
+        st.session_state.self_efficacy_avg_cached = _compute_self_efficacy_average()
+    return st.session_state.self_efficacy_avg_cached
+
+
 def save_to_csv(session_data, timestamp):
     """
     세션 데이터를 CSV로 저장
@@ -367,10 +492,11 @@ def save_to_csv(session_data, timestamp):
         f"korean_session{session_num}_{st.session_state.session_id}_{timestamp}.csv"
     )
     
+    # 스키마는 build_session_data의 키 순서 그대로 사용 (헤더 1행 + 데이터 1행)
     with open(csv_filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=session_data.keys())
-        writer.writeheader()
-        writer.writerow(session_data)
+        writer = csv.writer(csvfile)
+        writer.writerow(session_data.keys())
+        writer.writerow(session_data.values())
     
     return csv_filename
 
@@ -391,36 +517,32 @@ def save_audio_files(timestamp):
             FOLDERS["audio_recordings"], 
             f"session{session_num}_{st.session_state.session_id}_{timestamp}"
         )
-        os.makedirs(folder_name, exist_ok=True)
+        _ensure_dir(folder_name)
         
         saved_files = []
         
         # 첫 번째 녹음
         if hasattr(st.session_state, 'first_audio') and st.session_state.first_audio:
             file_path = os.path.join(folder_name, "first_audio.wav")
-            with open(file_path, "wb") as f:
-                f.write(st.session_state.first_audio["bytes"])
+            _write_bytes(file_path, st.session_state.first_audio["bytes"])
             saved_files.append("first_audio.wav")
         
         # 두 번째 녹음
         if hasattr(st.session_state, 'second_audio') and st.session_state.second_audio:
             file_path = os.path.join(folder_name, "second_audio.wav")
-            with open(file_path, "wb") as f:
-                f.write(st.session_state.second_audio["bytes"])
+            _write_bytes(file_path, st.session_state.second_audio["bytes"])
             saved_files.append("second_audio.wav")
         
         # 모델 음성 (일반 속도)
         if st.session_state.model_audio.get("normal"):
             file_path = os.path.join(folder_name, "model_normal.mp3")
-            with open(file_path, "wb") as f:
-                f.write(st.session_state.model_audio["normal"])
+            _write_bytes(file_path, st.session_state.model_audio["normal"])
             saved_files.append("model_normal.mp3")
         
         # 모델 음성 (느린 속도)
         if st.session_state.model_audio.get("slow"):
             file_path = os.path.join(folder_name, "model_slow.mp3")
-            with open(file_path, "wb") as f:
-                f.write(st.session_state.model_audio["slow"])
+            _write_bytes(file_path, st.session_state.model_audio["slow"])
             saved_files.append("model_slow.mp3")
         
         return folder_name, saved_files
@@ -430,106 +552,199 @@ def save_audio_files(timestamp):
         return None, []
 
 
-def create_participant_info_file(session_id, timestamp):
+def build_participant_info_content(session_id, timestamp, efficacy_avg):
     """
-    참여자 정보 파일 생성 (자기효능감 + Task Completion Check 포함)
+    참여자 정보 텍스트 생성 (자기효능감 + Task Completion Check 포함)
+    ZIP에 writestr로 바로 기록하므로 임시 파일을 만들지 않음
     
     Args:
         session_id: 세션 ID
         timestamp: 타임스탬프
+        efficacy_avg: 자기효능감 평균
         
     Returns:
-        str: 생성된 파일 경로
+        str: 참여자 정보 텍스트 (실패 시 None)
     """
     try:
-        info_filename = os.path.join(FOLDERS["data"], f"{session_id}_participant_info.txt")
-        
         original_nickname = getattr(st.session_state, 'original_nickname', 'Unknown')
         session_label = getattr(st.session_state, 'session_label', SESSION_LABELS.get(CURRENT_SESSION, "Session 1"))
         learning_duration = getattr(st.session_state, 'learning_duration', 'Not specified')
         
-        # 자기효능감 점수 수집 (12개)
-        efficacy_scores = []
-        for i in range(1, 13):
-            score = getattr(st.session_state, f'self_efficacy_{i}', 'N/A')
-            efficacy_scores.append(f"Item {i}: {score}/5")
-        
-        efficacy_avg = calculate_self_efficacy_average()
-        
         research_scores = getattr(st.session_state, 'research_scores', {})
         accuracy_score = research_scores.get('accuracy_score', 'N/A')
         fluency_score = research_scores.get('fluency_score', 'N/A')
         error_rate = research_scores.get('error_rate', 'N/A')
         word_count = research_scores.get('word_count', 'N/A')
         
-        # Task Completion Check 정보 추출
-        task_check_data = extract_task_completion_check(st.session_state.feedback.get('detailed_feedback', ''))
-        
-        info_content = f"""=== PARTICIPANT INFORMATION ===
-Anonymous ID: {session_id}
-Original Nickname: {original_nickname}
-Session: {session_label} (Session {CURRENT_SESSION})
-Timestamp: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')}  # 🔥 KST 추가
-Save Trigger: Auto-save after second recording completion
-
-=== BACKGROUND INFORMATION ===
-Learning Duration: {learning_duration}
-
-=== SELF-EFFICACY SCORES (1-5 scale) ===
-{chr(13).join(efficacy_scores)}
-Average Self-Efficacy: {efficacy_avg}/5.0
-
-=== TASK COMPLETION CHECK ===
-Past Vacation Coverage: {task_check_data.get('past_vacation_status', 'Unknown')}
-Future Plans Coverage: {task_check_data.get('future_plans_status', 'Unknown')}
-Tense Usage: {task_check_data.get('tense_usage', 'Unknown')}
-Both Topics Covered: {'Yes' if task_check_data.get('both_topics_covered') else 'No'}
-Missing Topics: {', '.join(task_check_data.get('missing_topics', [])) if task_check_data.get('missing_topics') else 'None'}
-
-=== EXPERIMENT DETAILS ===
-Question: {EXPERIMENT_QUESTION}
-First Recording Duration: {getattr(st.session_state, 'audio_duration_1', 0):.1f} seconds
-Second Recording Duration: {getattr(st.session_state, 'audio_duration_2', 0):.1f} seconds
-Student UI Score: {st.session_state.feedback.get('interview_readiness_score', 'N/A')}/10
-
-=== RESEARCH SCORES ===
-Accuracy Score: {accuracy_score}/10 (Error rate: {error_rate}%)
-Fluency Score: {fluency_score}/10 (Word count: {word_count})
-Dual Evaluation System: {getattr(st.session_state, 'gpt_debug_info', {}).get('dual_evaluation', False)}
-
-=== CONSENT INFORMATION ===
-Consent Given: {getattr(st.session_state, 'consent_given', False)}
-Consent Timestamp: {getattr(st.session_state, 'consent_timestamp', 'N/A')}
-GDPR Compliant: {getattr(st.session_state, 'gdpr_compliant', False)}
-Zoom Interview Consent: {getattr(st.session_state, 'consent_zoom_interview', False)}
-Consent File Type: HTML (Korean language support)
-
-=== DATA MANAGEMENT ===
-Data Retention Until: {(datetime.now(KST) + timedelta(days=DATA_RETENTION_DAYS)).strftime('%Y-%m-%d')}  # 🔥 KST 추가
-Storage Method: GCS ZIP Archive (Auto-save after 2nd recording)
-Last Updated: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')}  # 🔥 KST 추가
-
-=== FOR RESEARCHER ===
-This file contains the link between the anonymous ID and the original nickname.
-Data was automatically saved after second recording completion.
-Self-efficacy scores (1-5 scale) collected before experiment.
-Task Completion Check shows whether both topics (past/future) were covered.
-Consent form is stored as HTML file for Korean language compatibility.
-TOPIK reference scores (3 areas) stored in Excel file: reference_scores_{timestamp}.xlsx
-
-Contact: pen0226@gmail.com for any data requests or questions.
-"""
-        
-        with open(info_filename, 'w', encoding='utf-8') as f:
-            f.write(info_content)
+        now = datetime.now(KST)
+        now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+        retention_until = (now + timedelta(days=DATA_RETENTION_DAYS)).strftime('%Y-%m-%d')
         
-        return info_filename
+        # Task Completion Check 정보 추출
+        task_check_data = get_task_completion_check(st.session_state.feedback.get('detailed_feedback', ''))
+        missing_topics = task_check_data.get('missing_topics')
+        
+        # 🔥 한 줄씩 모아 마지막에 한 번만 join (KST 기준 시각)
+        parts = [
+            "=== PARTICIPANT INFORMATION ===",
+            f"Anonymous ID: {session_id}",
+            f"Original Nickname: {original_nickname}",
+            f"Session: {session_label} (Session {CURRENT_SESSION})",
+            f"Timestamp: {now_str}",
+            "Save Trigger: Auto-save after second recording completion",
+            "",
+            "=== BACKGROUND INFORMATION ===",
+            f"Learning Duration: {learning_duration}",
+            "",
+            "=== SELF-EFFICACY SCORES (1-5 scale) ===",
+        ]
+        # 자기효능감 점수 (12개)
+        parts += [f"Item {i}: {st.session_state.get(key, 'N/A')}/5" for i, key in enumerate(_EFFICACY_KEYS, 1)]
+        parts += [
+            f"Average Self-Efficacy: {efficacy_avg}/5.0",
+            "",
+            "=== TASK COMPLETION CHECK ===",
+            f"Past Vacation Coverage: {task_check_data.get('past_vacation_status', 'Unknown')}",
+            f"Future Plans Coverage: {task_check_data.get('future_plans_status', 'Unknown')}",
+            f"Tense Usage: {task_check_data.get('tense_usage', 'Unknown')}",
+            f"Both Topics Covered: {'Yes' if task_check_data.get('both_topics_covered') else 'No'}",
+            f"Missing Topics: {', '.join(missing_topics) if missing_topics else 'None'}",
+            "",
+            "=== EXPERIMENT DETAILS ===",
+            f"Question: {EXPERIMENT_QUESTION}",
+            f"First Recording Duration: {getattr(st.session_state, 'audio_duration_1', 0):.1f} seconds",
+            f"Second Recording Duration: {getattr(st.session_state, 'audio_duration_2', 0):.1f} seconds",
+            f"Student UI Score: {st.session_state.feedback.get('interview_readiness_score', 'N/A')}/10",
+            "",
+            "=== RESEARCH SCORES ===",
+            f"Accuracy Score: {accuracy_score}/10 (Error rate: {error_rate}%)",
+            f"Fluency Score: {fluency_score}/10 (Word count: {word_count})",
+            f"Dual Evaluation System: {getattr(st.session_state, 'gpt_debug_info', {}).get('dual_evaluation', False)}",
+            "",
+            "=== CONSENT INFORMATION ===",
+            f"Consent Given: {getattr(st.session_state, 'consent_given', False)}",
+            f"Consent Timestamp: {getattr(st.session_state, 'consent_timestamp', 'N/A')}",
+            f"GDPR Compliant: {getattr(st.session_state, 'gdpr_compliant', False)}",
+            f"Zoom Interview Consent: {getattr(st.session_state, 'consent_zoom_interview', False)}",
+            "Consent File Type: HTML (Korean language support)",
+            "",
+            "=== DATA MANAGEMENT ===",
+            f"Data Retention Until: {retention_until}",
+            "Storage Method: GCS ZIP Archive (Auto-save after 2nd recording)",
+            f"Last Updated: {now_str}",
+            "",
+            "=== FOR RESEARCHER ===",
+            "This file contains the link between the anonymous ID and the original nickname.",
+            "Data was automatically saved after second recording completion.",
+            "Self-efficacy scores (1-5 scale) collected before experiment.",
+            "Task Completion Check shows whether both topics (past/future) were covered.",
+            "Consent form is stored as HTML file for Korean language compatibility.",
+            f"TOPIK reference scores (3 areas) stored in Excel file: reference_scores_{timestamp}.xlsx",
+            "",
+            "Contact: pen0226@gmail.com for any data requests or questions.",
+            "",
+        ]
+        info_content = "\n".join(parts)
+        
+        return info_content
     
     except Exception as e:
         return None
     
     
 
+def build_readme_content(session_id, session_num, timestamp, excel_included, efficacy_avg):
+    """
+    ZIP 내용 요약(README) 텍스트 생성
+    
+    Args:
+        session_id: 세션 ID
+        session_num: 세션 번호
+        timestamp: 타임스탬프
+        excel_included: TOPIK 참고용 엑셀 포함 여부
+        efficacy_avg: 자기효능감 평균
+        
+    Returns:
+        str: README 텍스트
+    """
+    parts = [
+        "=== ZIP CONTENTS SUMMARY ===",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Participant: {session_id} (Session {session_num})",
+        "Save Trigger: Auto-save after second recording completion",
+        "",
+        "Files included:",
+        "- participant_info.txt: Participant details + Research scores + Self-efficacy scores",
+        f"- session_data_{timestamp}.csv: Complete session data with dual evaluation + self-efficacy data",
+        f"- reference_scores_{timestamp}.xlsx: TOPIK holistic reference scores for both attempts {'✅ INCLUDED' if excel_included else '❌ MISSING'}",
+        f"- consent_form_{session_id}.html: Signed consent form (HTML format for Korean support)",
+        "- audio/: All recorded audio files (student + model pronunciations)",
+        "",
+        "SELF-EFFICACY DATA:",
+        "- 12 items measured on 1-5 scale",
+        f"- Average self-efficacy score: {efficacy_avg}/5.0",
+        "- Individual scores stored in CSV under self_efficacy_1 through self_efficacy_12",
+        "",
+        "TOPIK REFERENCE SCORES:",
+        "- Holistic rubric scoring: Content/Task, Language Use, Delivery (STT-based)",
+        "- Each area scored 1-5 points (holistic impression-based)",
+        "- Total score: simple sum (3-15 points)",
+        "",
+        "CONSENT FORM FORMAT:",
+        "- HTML format for perfect Korean language support",
+        "- Can be saved as PDF using browser print function (Ctrl+P)",
+        "- Avoids character encoding issues that occurred with direct PDF generation",
+        "",
+        "RESEARCH WORKFLOW:",
+        "1. Use CSV data for basic analysis",
+        "2. Use Excel file for TOPIK reference scores (3 areas)",
+        "3. Raw audio files available for manual grading",
+        "4. All raw data preserved for transparency",
+        "",
+        "IMPORTANT: Data was automatically saved after second recording completion.",
+        "This ensures no data loss even if survey is not completed.",
+        "",
+        "Contact researcher: pen0226@gmail.com",
+        "",
+    ]
+    return "\n".join(parts)
+
+
+def _read_file_bytes(path):
+    """
+    ZIP에 넣을 파일을 바이트로 읽기 (없으면 None)
+    
+    Args:
+        path: 파일 경로
+        
+    Returns:
+        bytes: 파일 내용 또는 None
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _read_first_existing(paths):
+    """
+    후보 경로 중 처음으로 존재하는 파일을 읽기
+    
+    Args:
+        paths: 후보 파일 경로 목록 (None은 건너뜀)
+        
+    Returns:
+        tuple: (몇 번째 후보인지 1부터, 파일 내용) - 모두 없으면 (None, None)
+    """
+    for index, path in enumerate(paths, 1):
+        if path:
+            data = _read_file_bytes(path)
+            if data is not None:
+                return index, data
+    return None, None
+
+
 def create_comprehensive_backup_zip(session_id, timestamp, reference_excel_filename=None):
     """
     모든 세션 데이터를 포함한 완전한 백업 ZIP 생성 (TOPIK 엑셀 포함 보장)
@@ -544,136 +759,98 @@ def create_comprehensive_backup_zip(session_id, timestamp, reference_excel_filen
     """
     try:
         session_num = getattr(st.session_state, 'session_number', CURRENT_SESSION)
+        efficacy_avg = calculate_self_efficacy_average()  # participant_info/README 공용
         zip_filename = os.path.join(
             FOLDERS["data"], 
             f"{session_id}_{timestamp}.zip"
         )
         
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        csv_file = os.path.join(FOLDERS["data"], f"korean_session{session_num}_{session_id}_{timestamp}.csv")
+        reference_excel_direct = os.path.join(FOLDERS["data"], f"reference_scores_{timestamp}.xlsx")
+        consent_html = os.path.join(FOLDERS["data"], f"{session_id}_consent.html")
+        
+        # 🔥 첨부 파일 읽기는 스레드에서 동시에 진행 (ZipFile은 스레드 안전하지 않으므로 쓰기는 아래에서 순서대로)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            csv_future = executor.submit(_read_file_bytes, csv_file)
+            # 방법 1: 명시적으로 전달받은 경로 / 방법 2: 직접 경로 구성해서 찾기
+            excel_future = executor.submit(_read_first_existing, [reference_excel_filename, reference_excel_direct])
+            consent_future = executor.submit(_read_file_bytes, consent_html)
             
-            # 참여자 정보 파일 생성 및 추가
-            participant_info_file = create_participant_info_file(session_id, timestamp)
-            if participant_info_file and os.path.exists(participant_info_file):
-                zipf.write(participant_info_file, "participant_info.txt")
+            # 텍스트 생성은 st.session_state를 읽으므로 메인 스레드에서
+            participant_info = build_participant_info_content(session_id, timestamp, efficacy_avg)
             
-            # CSV 파일 추가
-            csv_file = os.path.join(FOLDERS["data"], f"korean_session{session_num}_{session_id}_{timestamp}.csv")
-            if os.path.exists(csv_file):
-                zipf.write(csv_file, f"session_data_{timestamp}.csv")
-                print(f"✅ CSV file included: session_data_{timestamp}.csv")
+            csv_data = csv_future.result()
+            excel_method, excel_data = excel_future.result()
+            consent_data = consent_future.result()
+        
+        # 🔥 ZIP은 디스크에 바로 기록 (음성 포함 ZIP 전체를 메모리/세션에 들고 있지 않음 - 업로드는 파일에서 스트리밍)
+        # 작은 write 시스템콜이 반복되지 않도록 큰 버퍼로 파일을 직접 열어 ZipFile에 전달
+        zip_file = open(zip_filename, 'wb', buffering=ZIP_WRITE_BUFFER_SIZE)
+        try:
+            with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
             
-            # 🔥 TOPIK 참고용 엑셀 파일 추가 (확실한 경로 확인)
-            excel_included = False
+                # 참여자 정보 텍스트를 ZIP에 직접 기록
+                if participant_info:
+                    zipf.writestr("participant_info.txt", participant_info.encode("utf-8"))
             
-            # 방법 1: 명시적으로 전달받은 경로 사용
-            if reference_excel_filename and os.path.exists(reference_excel_filename):
-                zipf.write(reference_excel_filename, f"reference_scores_{timestamp}.xlsx")
-                print(f"✅ Reference Excel file included (method 1): reference_scores_{timestamp}.xlsx")
-                excel_included = True
+                # CSV 파일 추가
+                if csv_data is not None:
+                    zipf.writestr(f"session_data_{timestamp}.csv", csv_data)
+                    print(f"✅ CSV file included: session_data_{timestamp}.csv")
             
-            # 방법 2: 직접 경로 구성해서 찾기
-            if not excel_included:
-                reference_excel_direct = os.path.join(FOLDERS["data"], f"reference_scores_{timestamp}.xlsx")
-                if os.path.exists(reference_excel_direct):
-                    zipf.write(reference_excel_direct, f"reference_scores_{timestamp}.xlsx")
-                    print(f"✅ Reference Excel file included (method 2): reference_scores_{timestamp}.xlsx")
+                # 🔥 TOPIK 참고용 엑셀 파일 추가 (확실한 경로 확인)
+                excel_included = False
+                
+                if excel_data is not None:
+                    zipf.writestr(f"reference_scores_{timestamp}.xlsx", excel_data, compress_type=zipfile.ZIP_STORED)
+                    print(f"✅ Reference Excel file included (method {excel_method}): reference_scores_{timestamp}.xlsx")
                     excel_included = True
             
-            # 방법 3: 패턴 매칭으로 찾기
-            if not excel_included:
-                import glob
-                pattern = os.path.join(FOLDERS["data"], f"reference_scores_*.xlsx")
-                excel_files = glob.glob(pattern)
-                if excel_files:
-                    # 가장 최신 파일 또는 timestamp 매칭하는 파일 사용
-                    matching_files = [f for f in excel_files if timestamp in f]
-                    if matching_files:
-                        latest_excel = matching_files[0]
-                    else:
-                        latest_excel = max(excel_files, key=os.path.getctime)
+                # 방법 3: 패턴 매칭으로 찾기
+                if not excel_included:
+                    import glob
+                    pattern = os.path.join(FOLDERS["data"], f"reference_scores_*.xlsx")
+                    excel_files = glob.glob(pattern)
+                    if excel_files:
+                        # 가장 최신 파일 또는 timestamp 매칭하는 파일 사용
+                        matching_files = [f for f in excel_files if timestamp in f]
+                        if matching_files:
+                            latest_excel = matching_files[0]
+                        else:
+                            latest_excel = max(excel_files, key=os.path.getctime)
                     
-                    zipf.write(latest_excel, f"reference_scores_{timestamp}.xlsx")
-                    print(f"✅ Reference Excel file included (method 3): reference_scores_{timestamp}.xlsx")
-                    excel_included = True
+                        zipf.write(latest_excel, f"reference_scores_{timestamp}.xlsx", compress_type=zipfile.ZIP_STORED)
+                        print(f"✅ Reference Excel file included (method 3): reference_scores_{timestamp}.xlsx")
+                        excel_included = True
             
-            if not excel_included:
-                print(f"⚠️ Reference Excel file NOT FOUND for inclusion in ZIP")
-                print(f"   Checked paths:")
-                print(f"   - {reference_excel_filename}")
-                print(f"   - {os.path.join(FOLDERS['data'], f'reference_scores_{timestamp}.xlsx')}")
-            
-            # HTML 동의서 파일 추가
-            consent_html = os.path.join(FOLDERS["data"], f"{session_id}_consent.html")
-            if os.path.exists(consent_html):
-                zipf.write(consent_html, f"consent_form_{session_id}.html")
-                print(f"✅ Consent HTML file included: {session_id}_consent.html")
-            else:
-                print(f"⚠️ Consent HTML file not found: {session_id}_consent.html")
+                if not excel_included:
+                    print(f"⚠️ Reference Excel file NOT FOUND for inclusion in ZIP")
+                    print(f"   Checked paths:")
+                    print(f"   - {reference_excel_filename}")
+                    print(f"   - {reference_excel_direct}")
             
-            # 음성 파일들 추가
-            audio_folder = os.path.join(FOLDERS["audio_recordings"], f"session{session_num}_{session_id}_{timestamp}")
-            if os.path.exists(audio_folder):
-                for file in os.listdir(audio_folder):
-                    file_path = os.path.join(audio_folder, file)
-                    zipf.write(file_path, f"audio/{file}")
-                print(f"✅ Audio files included from: {audio_folder}")
-            
-            # ZIP 내용 요약 파일 추가
-            research_scores = getattr(st.session_state, 'research_scores', {})
-            efficacy_avg = calculate_self_efficacy_average()
+                # HTML 동의서 파일 추가
+                if consent_data is not None:
+                    zipf.writestr(f"consent_form_{session_id}.html", consent_data)
+                    print(f"✅ Consent HTML file included: {session_id}_consent.html")
+                else:
+                    print(f"⚠️ Consent HTML file not found: {session_id}_consent.html")
             
-            readme_content = f"""=== ZIP CONTENTS SUMMARY ===
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Participant: {session_id} (Session {session_num})
-Save Trigger: Auto-save after second recording completion
-
-Files included:
-- participant_info.txt: Participant details + Research scores + Self-efficacy scores
-- session_data_{timestamp}.csv: Complete session data with dual evaluation + self-efficacy data
-- reference_scores_{timestamp}.xlsx: TOPIK holistic reference scores for both attempts {'✅ INCLUDED' if excel_included else '❌ MISSING'}
-- consent_form_{session_id}.html: Signed consent form (HTML format for Korean support)
-- audio/: All recorded audio files (student + model pronunciations)
-
-SELF-EFFICACY DATA:
-- 12 items measured on 1-5 scale
-- Average self-efficacy score: {efficacy_avg}/5.0
-- Individual scores stored in CSV under self_efficacy_1 through self_efficacy_12
-
-TOPIK REFERENCE SCORES:
-- Holistic rubric scoring: Content/Task, Language Use, Delivery (STT-based)
-- Each area scored 1-5 points (holistic impression-based)
-- Total score: simple sum (3-15 points)
-
-CONSENT FORM FORMAT:
-- HTML format for perfect Korean language support
-- Can be saved as PDF using browser print function (Ctrl+P)
-- Avoids character encoding issues that occurred with direct PDF generation
-
-RESEARCH WORKFLOW:
-1. Use CSV data for basic analysis
-2. Use Excel file for TOPIK reference scores (3 areas)
-3. Raw audio files available for manual grading
-4. All raw data preserved for transparency
-
-IMPORTANT: Data was automatically saved after second recording completion.
-This ensures no data loss even if survey is not completed.
-
-Contact researcher: pen0226@gmail.com
-"""
+                # 음성 파일들 추가
+                audio_folder = os.path.join(FOLDERS["audio_recordings"], f"session{session_num}_{session_id}_{timestamp}")
+                if os.path.isdir(audio_folder):
+                    with os.scandir(audio_folder) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                zipf.write(entry.path, f"audio/{entry.name}", compress_type=_zip_compress_type(entry.name))
+                    print(f"✅ Audio files included from: {audio_folder}")
             
-            readme_path = os.path.join(FOLDERS["data"], f"{session_id}_readme.txt")
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(readme_content)
-            zipf.write(readme_path, "README.txt")
-        
-        # 임시 파일들 정리
-        temp_files = [participant_info_file, readme_path]
-        for temp_file in temp_files:
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+                # ZIP 내용 요약 파일 추가
+                readme_content = build_readme_content(session_id, session_num, timestamp, excel_included, efficacy_avg)
+                
+                zipf.writestr("README.txt", readme_content.encode("utf-8"))
+        finally:
+            zip_file.close()
         
         print(f"✅ Comprehensive backup ZIP created: {zip_filename}")
         return zip_filename
@@ -683,16 +860,92 @@ Contact researcher: pen0226@gmail.com
         return None
 
 
+def get_backup_zip_bytes(zip_filename):
+    """
+    백업 ZIP 내용을 디스크에서 읽어 반환 (다운로드 버튼용 - 세션/프로세스 캐시에 보관하지 않음)
+    
+    Args:
+        zip_filename: ZIP 파일 경로
+        
+    Returns:
+        bytes: ZIP 내용 (파일이 없으면 None)
+    """
+    return _read_file_bytes(zip_filename)
+
+
+# nickname_mapping.csv 업로드 기록 파일 (data 폴더 안)
+MAPPING_UPLOAD_MARKER = '.mapping_last_upload'
+MAPPING_FORCE_UPLOAD_EVERY = 10  # 변경이 없어도 10번째 세션마다 강제 업로드 (정합성 점검)
+
+# 현재 업로드 로그 파일 날짜/핸들 (_write_upload_log에서 날짜 변경 감지용)
+_upload_log_state = {}
+# 동시 세션이 날짜 변경 시 파일 핸들을 중복 교체하거나 로그 줄이 섞이지 않도록 잠금
+_UPLOAD_LOG_LOCK = threading.Lock()
+
+# GCS 클라이언트/버킷 캐시 (업로드마다 인증 정보 파싱 + 클라이언트 생성 반복 방지)
+_GCS_CACHE = {}
+GCS_BUCKET_CHECK_TTL = 600  # bucket.exists() 성공 결과 재사용 시간 (10분, 실패는 캐시하지 않음)
+_GCS_CACHE_LOCK = threading.Lock()
+
+
+def clear_gcs_client():
+    """
+    캐시된 GCS 클라이언트 초기화 (설정 변경/테스트 시 사용)
+    """
+    with _GCS_CACHE_LOCK:
+        _GCS_CACHE.clear()
+
+
 def get_gcs_client():
     """
-    GCS 클라이언트 초기화
+    GCS 클라이언트 초기화 (성공한 클라이언트는 프로세스 단위로 재사용)
+    
+    Returns:
+        tuple: (client, bucket, status_message)
+    """
+    if 'client' in _GCS_CACHE:
+        return _GCS_CACHE['client'], _GCS_CACHE['bucket'], "Success"
+    
+    # 동시 업로드 스레드가 클라이언트를 중복 생성하지 않도록 잠금
+    with _GCS_CACHE_LOCK:
+        if 'client' in _GCS_CACHE:
+            return _GCS_CACHE['client'], _GCS_CACHE['bucket'], "Success"
+        
+        client, bucket, status = _create_gcs_client()
+        if client:
+            _GCS_CACHE['client'] = client
+            _GCS_CACHE['bucket'] = bucket
+        return client, bucket, status
+
+
+def _parse_service_account():
+    """
+    서비스 계정 설정 파싱 (TOML dict는 그대로 사용, JSON 문자열만 파싱)
+    
+    Returns:
+        tuple: (credentials_dict, format_type) - 지원하지 않는 타입이면 (None, "Unknown format")
+        
+    Raises:
+        json.JSONDecodeError: JSON 문자열 형식이 잘못된 경우
+    """
+    if isinstance(GCS_SERVICE_ACCOUNT, dict):
+        return dict(GCS_SERVICE_ACCOUNT), "TOML format"
+    if isinstance(GCS_SERVICE_ACCOUNT, str):
+        loads = orjson.loads if orjson else json.loads
+        return loads(GCS_SERVICE_ACCOUNT), "JSON format"
+    return None, "Unknown format"
+
+
+def _create_gcs_client():
+    """
+    GCS 클라이언트 생성
     
     Returns:
         tuple: (client, bucket, status_message)
     """
     try:
-        from google.cloud import storage
-        import json
+        if storage is None:
+            raise _STORAGE_IMPORT_ERROR
         
         if not GCS_ENABLED:
             return None, None, "GCS upload is disabled in configuration"
@@ -701,14 +954,10 @@ def get_gcs_client():
             return None, None, "GCS service account not configured"
         
         try:
-            if isinstance(GCS_SERVICE_ACCOUNT, dict):
-                credentials_dict = dict(GCS_SERVICE_ACCOUNT)
-                print(f"Using TOML format service account (Project: {credentials_dict.get('project_id', 'Unknown')})")
-            elif isinstance(GCS_SERVICE_ACCOUNT, str):
-                credentials_dict = json.loads(GCS_SERVICE_ACCOUNT)
-                print(f"Using JSON format service account (Project: {credentials_dict.get('project_id', 'Unknown')})")
-            else:
+            credentials_dict, format_type = _parse_service_account()
+            if credentials_dict is None:
                 return None, None, f"Unexpected service account type: {type(GCS_SERVICE_ACCOUNT)}"
+            print(f"Using {format_type} service account (Project: {credentials_dict.get('project_id', 'Unknown')})")
                 
         except json.JSONDecodeError:
             return None, None, "Invalid JSON format in service account"
@@ -742,11 +991,15 @@ def upload_to_gcs(local_path, blob_name):
         if not client:
             return None, f"GCS client error: {status}"
         
-        if not os.path.exists(local_path):
-            return None, f"File not found: {local_path}"
-        
         blob = bucket.blob(blob_name)
-        blob.upload_from_filename(local_path)
+        blob.chunk_size = GCS_UPLOAD_CHUNK_SIZE  # 큰 청크로 resumable 업로드 왕복 횟수 감소
+        content_type = 'application/zip' if blob_name.endswith('.zip') else None
+        try:
+            f = open(local_path, 'rb', buffering=GCS_UPLOAD_CHUNK_SIZE)
+        except FileNotFoundError:
+            return None, f"File not found: {local_path}"
+        with f:
+            blob.upload_from_file(f, size=os.fstat(f.fileno()).st_size, content_type=content_type)
         
         blob_url = f"gs://{GCS_BUCKET_NAME}/{blob_name}"
         print(f"File uploaded: {blob_name}")
@@ -771,13 +1024,15 @@ def check_mapping_file_freshness():
             return False, "No nickname in current session"
         
         mapping_file = os.path.join(FOLDERS["data"], 'nickname_mapping.csv')
-        if not os.path.exists(mapping_file):
+        try:
+            f = open(mapping_file, 'r', encoding='utf-8')
+        except FileNotFoundError:
             return False, "No local mapping file found"
         
         # 현재 세션의 타임스탬프 확인
         current_timestamp = datetime.now()
         
-        with open(mapping_file, 'r', encoding='utf-8') as f:
+        with f:
             reader = csv.DictReader(f)
             for row in reader:
                 if row.get('Nickname', '').strip().lower() == original_nickname.lower():
@@ -803,6 +1058,36 @@ def check_mapping_file_freshness():
         return True, f"Error checking freshness: {str(e)}"
 
 
+def _read_mapping_upload_marker():
+    """
+    마지막으로 업로드한 nickname_mapping.csv의 수정 시각과 이후 건너뛴 횟수 읽기
+    
+    Returns:
+        tuple: (last_mtime, skipped_count) - 기록이 없으면 (None, 0)
+    """
+    try:
+        with open(os.path.join(FOLDERS["data"], MAPPING_UPLOAD_MARKER), 'r', encoding='utf-8') as f:
+            last_mtime, skipped = f.read().split()
+        return float(last_mtime), int(skipped)
+    except (OSError, ValueError):
+        return None, 0
+
+
+def _write_mapping_upload_marker(mtime, skipped):
+    """
+    nickname_mapping.csv 업로드 기록 저장 (여러 인스턴스가 같은 data 폴더를 공유해도 동작)
+    
+    Args:
+        mtime: 업로드한 매핑 파일의 수정 시각
+        skipped: 마지막 업로드 이후 건너뛴 횟수
+    """
+    try:
+        with open(os.path.join(FOLDERS["data"], MAPPING_UPLOAD_MARKER), 'w', encoding='utf-8') as f:
+            f.write(f"{mtime!r} {skipped}")
+    except OSError:
+        pass
+
+
 def auto_backup_to_gcs(csv_filename, excel_filename, zip_filename, session_id, timestamp):
     """
     ZIP 파일만 GCS에 자동 백업 + 스마트한 nickname_mapping.csv 백업
@@ -816,59 +1101,87 @@ def auto_backup_to_gcs(csv_filename, excel_filename, zip_filename, session_id, t
         timestamp: 타임스탬프
         
     Returns:
-        tuple: (uploaded_files, errors)
+        tuple: (uploaded_files, errors, mapping_status) - mapping_status는 매핑 파일 업로드 결과/건너뛴 이유
     """
     uploaded_files = []
     errors = []
     
     if not GCS_ENABLED:
         errors.append("GCS upload is disabled in configuration")
-        return uploaded_files, errors
+        return uploaded_files, errors, "SKIPPED (GCS upload disabled)"
     
     session_num = getattr(st.session_state, 'session_number', CURRENT_SESSION)
     session_folder = GCS_SIMPLE_STRUCTURE.get(session_num, GCS_SIMPLE_STRUCTURE[1])
     
-    # ZIP 파일만 업로드 (엑셀은 ZIP 안에 포함됨)
-    if zip_filename and os.path.exists(zip_filename):
-        try:
+    # 🔥 스마트한 nickname_mapping.csv 백업 여부 (st.session_state 접근은 메인 스레드에서)
+    needs_upload, reason = check_mapping_file_freshness()
+    mapping_file = os.path.join(FOLDERS["data"], 'nickname_mapping.csv')
+    mapping_mtime = None
+    
+    # 마지막 업로드 이후 내용이 바뀌지 않았다면 건너뜀 (N번째 세션마다 강제 업로드)
+    if needs_upload and os.path.exists(mapping_file):
+        mapping_mtime = os.path.getmtime(mapping_file)
+        last_mtime, skipped = _read_mapping_upload_marker()
+        if last_mtime == mapping_mtime and skipped + 1 < MAPPING_FORCE_UPLOAD_EVERY:
+            _write_mapping_upload_marker(last_mtime, skipped + 1)
+            needs_upload, reason = False, "Unchanged since last upload"
+    
+    # 🔥 실제 결과를 기록 (로그에서 나중에 다시 추측하지 않음)
+    mapping_status = f"SKIPPED ({reason})"
+    
+    # ZIP과 매핑 파일 업로드를 동시에 실행 (네트워크 대기 시간 겹치기)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        zip_future = None
+        mapping_future = None
+        
+        # ZIP 파일만 업로드 (엑셀은 ZIP 안에 포함됨)
+        if zip_filename and os.path.exists(zip_filename):
             blob_name = f"{session_folder}{session_id}_{timestamp}.zip"
-            blob_url, result_msg = upload_to_gcs(zip_filename, blob_name)
-            
-            if blob_url:
-                uploaded_files.append(blob_name)
-                print(f"✅ Session {session_num} ZIP uploaded: {blob_name}")
+            zip_future = executor.submit(upload_to_gcs, zip_filename, blob_name)
+        else:
+            errors.append("ZIP file not found for upload")
+        
+        if needs_upload:
+            if os.path.exists(mapping_file):
+                mapping_blob_name = "nickname_mapping.csv"
+                mapping_future = executor.submit(upload_to_gcs, mapping_file, mapping_blob_name)
             else:
-                errors.append(f"ZIP upload failed: {result_msg}")
+                mapping_status = "SKIPPED (no local mapping file)"
+                print(f"📝 No local mapping file to upload")
+        else:
+            print(f"📝 Mapping file upload skipped: {reason}")
+        
+        if zip_future:
+            try:
+                blob_url, result_msg = zip_future.result()
                 
-        except Exception as e:
-            errors.append(f"ZIP upload error: {str(e)}")
-    else:
-        errors.append("ZIP file not found for upload")
-    
-    # 🔥 스마트한 nickname_mapping.csv 백업 (중복 방지)
-    needs_upload, reason = check_mapping_file_freshness()
-    
-    if needs_upload:
-        mapping_file = os.path.join(FOLDERS["data"], 'nickname_mapping.csv')
-        if os.path.exists(mapping_file):
+                if blob_url:
+                    uploaded_files.append(blob_name)
+                    print(f"✅ Session {session_num} ZIP uploaded: {blob_name}")
+                else:
+                    errors.append(f"ZIP upload failed: {result_msg}")
+                    
+            except Exception as e:
+                errors.append(f"ZIP upload error: {str(e)}")
+        
+        if mapping_future:
             try:
-                mapping_blob_name = "nickname_mapping.csv"
-                blob_url, result_msg = upload_to_gcs(mapping_file, mapping_blob_name)
+                blob_url, result_msg = mapping_future.result()
                 
                 if blob_url:
                     uploaded_files.append(mapping_blob_name)
+                    _write_mapping_upload_marker(mapping_mtime, 0)
+                    mapping_status = f"UPLOADED ({reason})"
                     print(f"📝 Mapping file uploaded: {reason}")
                 else:
+                    mapping_status = f"FAILED ({result_msg})"
                     errors.append(f"Mapping file upload failed: {result_msg}")
                     
             except Exception as e:
+                mapping_status = f"FAILED ({e})"
                 errors.append(f"Mapping file upload error: {str(e)}")
-        else:
-            print(f"📝 No local mapping file to upload")
-    else:
-        print(f"📝 Mapping file upload skipped: {reason}")
     
-    return uploaded_files, errors
+    return uploaded_files, errors, mapping_status
 
 
 def test_gcs_connection():
@@ -883,19 +1196,24 @@ def test_gcs_connection():
         if not client:
             return False, f"GCS connection failed: {status}"
         
-        if bucket.exists():
+        # 버킷 존재 확인은 네트워크 왕복이므로 성공한 결과만 일정 시간 재사용
+        # (실패는 캐시하지 않아 일시적 오류가 복구되면 바로 다시 연결됨으로 표시)
+        checked_at = _GCS_CACHE.get('bucket_ok_at')
+        if checked_at is not None and time.time() - checked_at < GCS_BUCKET_CHECK_TTL:
+            bucket_ok = True
+        else:
+            bucket_ok = bucket.exists()
+            if bucket_ok:
+                _GCS_CACHE['bucket_ok_at'] = time.time()
+        
+        if bucket_ok:
             project_id = "Unknown"
-            if isinstance(GCS_SERVICE_ACCOUNT, dict):
-                project_id = GCS_SERVICE_ACCOUNT.get('project_id', 'Unknown')
-                format_type = "TOML format"
-            else:
-                import json
-                try:
-                    service_info = json.loads(GCS_SERVICE_ACCOUNT)
+            try:
+                service_info, format_type = _parse_service_account()
+                if service_info:
                     project_id = service_info.get('project_id', 'Unknown')
-                    format_type = "JSON format"
-                except:
-                    format_type = "Unknown format"
+            except ValueError:
+                format_type = "Unknown format"
             
             return True, f"Connected successfully to bucket: {GCS_BUCKET_NAME} (Project: {project_id} - {format_type})"
         else:
@@ -905,7 +1223,43 @@ def test_gcs_connection():
         return False, f"Connection test failed: {str(e)}"
 
 
-def log_upload_status(session_id, timestamp, uploaded_files, errors, email_sent=False):
+def _write_upload_log(log_date, log_entry):
+    """
+    업로드 로그 기록 (날짜별 upload_log_YYYYMMDD.txt 핸들을 열어둔 채 재사용)
+    
+    Args:
+        log_date: 로그 날짜 (YYYYMMDD)
+        log_entry: 기록할 로그 텍스트
+        
+    Raises:
+        OSError: 파일 열기/쓰기 실패 (디스크 가득 참, 로그 폴더 없음 등)
+    """
+    with _UPLOAD_LOG_LOCK:
+        log_file = _upload_log_state.get('file')
+        if _upload_log_state.get('date') != log_date:
+            # 날짜가 바뀌면 이전 파일 핸들을 닫고 새 날짜 파일로 교체
+            if log_file is not None:
+                log_file.close()
+            _upload_log_state.clear()
+            log_filename = os.path.join(FOLDERS["logs"], f"upload_log_{log_date}.txt")
+            log_file = open(log_filename, 'a', encoding='utf-8')
+            _upload_log_state['file'] = log_file
+            _upload_log_state['date'] = log_date
+        
+        try:
+            log_file.write(log_entry)
+            log_file.flush()
+        except OSError:
+            # 실패한 핸들은 버려서 다음 기록 때 다시 열도록
+            _upload_log_state.clear()
+            try:
+                log_file.close()
+            except OSError:
+                pass  # 남은 버퍼도 쓸 수 없는 상태
+            raise
+
+
+def log_upload_status(session_id, timestamp, uploaded_files, errors, email_sent=False, mapping_status="UNKNOWN"):
     """
     GCS 업로드 결과를 로그 파일에 기록 (매핑 파일 동기화 정보 포함)
     
@@ -915,18 +1269,16 @@ def log_upload_status(session_id, timestamp, uploaded_files, errors, email_sent=
         uploaded_files: 업로드된 파일 목록
         errors: 오류 목록
         email_sent: 이메일 전송 여부
+        mapping_status: auto_backup_to_gcs가 반환한 매핑 파일 업로드 결과
         
     Returns:
         bool: 로그 기록 성공 여부
     """
     try:
-        os.makedirs(FOLDERS["logs"], exist_ok=True)
+        _ensure_dir(FOLDERS["logs"])
         
-        log_date = datetime.now(KST).strftime('%Y%m%d')  # 🔥 KST 추가
-        log_filename = os.path.join(
-            FOLDERS["logs"], 
-            f"upload_log_{log_date}.txt"
-        )
+        now = datetime.now(KST)  # 🔥 KST 추가
+        log_date = now.strftime('%Y%m%d')
         
         session_num = getattr(st.session_state, 'session_number', CURRENT_SESSION)
         session_label = getattr(st.session_state, 'session_label', SESSION_LABELS.get(CURRENT_SESSION, "Session 1"))
@@ -940,14 +1292,10 @@ def log_upload_status(session_id, timestamp, uploaded_files, errors, email_sent=
         # 자기효능감 평균 계산 (6개)
         efficacy_avg = calculate_self_efficacy_average()
         
-        # 🔥 매핑 파일 동기화 상태 확인
-        needs_upload, freshness_reason = check_mapping_file_freshness()
-        mapping_sync_status = "SKIPPED (consent.py already synced)" if not needs_upload else "UPLOADED (needed refresh)"
-        
         upload_status = "SUCCESS" if uploaded_files and not errors else "PARTIAL" if uploaded_files else "FAILED"
         
         log_entry = f"""
-[{datetime.now(KST).strftime(LOG_FORMAT['timestamp_format'])}] SESSION: {session_label} - {session_id}_{timestamp}  # 🔥 KST 추가
+[{now.strftime(LOG_FORMAT['timestamp_format'])}] SESSION: {session_label} - {session_id}_{timestamp}  # 🔥 KST 추가
 Nickname: {original_nickname}
 Status: {upload_status}
 Save Trigger: Auto-save after second recording completion
@@ -957,7 +1305,7 @@ TOPIK Scores: 3-area reference scores included in ZIP
 GCS Enabled: {GCS_ENABLED} (Service Account method - ZIP-only backup)
 Bucket: {GCS_BUCKET_NAME}
 Files uploaded: {len(uploaded_files)} ({', '.join(uploaded_files) if uploaded_files else 'None'})
-Mapping file sync: {mapping_sync_status} ({freshness_reason})
+Mapping file sync: {mapping_status}
 Errors: {len(errors)} ({'; '.join(errors) if errors else 'None'})
 Email notification: {'Sent' if email_sent else 'Not sent/Failed'}
 Data Safety: Secured before survey step
@@ -966,14 +1314,33 @@ Excel Format: TOPIK 3-area scores included in ZIP only
 {'='*80}
 """
         
-        with open(log_filename, 'a', encoding='utf-8') as log_file:
-            log_file.write(log_entry)
+        _write_upload_log(log_date, log_entry)
         
         return True
     except Exception:
         return False
 
 
+# 다운로드 버튼용 파일 캐시 최대 개수 (프로세스 전체 공유 - 참여자 데이터가 오래 쌓이지 않도록 작게 유지)
+DOWNLOAD_CACHE_MAX_ENTRIES = 8
+
+
+@st.cache_data(ttl=3600, max_entries=DOWNLOAD_CACHE_MAX_ENTRIES, show_spinner=False)
+def _load_text(path, mtime):
+    """
+    다운로드 버튼용 텍스트 파일 읽기 (파일 경로 + 수정 시각 기준 캐시)
+    
+    Args:
+        path: 파일 경로
+        mtime: 파일 수정 시각 (캐시 키, 파일이 바뀌면 다시 읽음)
+        
+    Returns:
+        str: 파일 내용
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
 def display_download_buttons(csv_filename, excel_filename, zip_filename):
     """
     연구자용 다운로드 버튼들 표시 (TOPIK 엑셀은 ZIP에만 포함)
@@ -994,11 +1361,11 @@ def display_download_buttons(csv_filename, excel_filename, zip_filename):
     timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     with col1:
-        # ZIP 완전 백업 다운로드
-        if zip_filename and os.path.exists(zip_filename):
+        # ZIP 완전 백업 다운로드 (음성 포함 ZIP은 프로세스 캐시에 넣지 않고 디스크에서 바로 읽음)
+        zip_data = get_backup_zip_bytes(zip_filename) if zip_filename else None
+        
+        if zip_data is not None:
             try:
-                with open(zip_filename, 'rb') as f:
-                    zip_data = f.read()
                 st.download_button(
                     label=f"📦 Session {session_num} Complete Backup ZIP",
                     data=zip_data,
@@ -1013,10 +1380,14 @@ def display_download_buttons(csv_filename, excel_filename, zip_filename):
     
     with col2:
         # CSV 다운로드
-        if csv_filename and os.path.exists(csv_filename):
+        try:
+            csv_mtime = os.path.getmtime(csv_filename) if csv_filename else None
+        except OSError:
+            csv_mtime = None
+        
+        if csv_mtime is not None:
             try:
-                with open(csv_filename, 'r', encoding='utf-8') as f:
-                    csv_data = f.read()
+                csv_data = _load_text(csv_filename, csv_mtime)
                 st.download_button(
                     label="📄 CSV Data (Open in Excel)",
                     data=csv_data,
@@ -1060,8 +1431,8 @@ def display_session_details():
         
         # expander 대신 버튼으로 토글 방식 사용
         if st.button("🎯 Show Self-Efficacy Details"):
-            for i in range(1, 13):
-                score = getattr(st.session_state, f'self_efficacy_{i}', 0)
+            for i, key in enumerate(_EFFICACY_KEYS, 1):
+                score = st.session_state.get(key, 0)
                 if score:
                     st.write(f"Item {i}: {score}/5")
     
@@ -1180,6 +1551,16 @@ def display_data_quality_info():
             st.write("💾 **Data Status:** ⚠️ Not yet saved")
 
 
+# 음성 길이 품질 구간 경계(초)와 구간별 설명 (경계값은 위 구간에 포함)
+_QUALITY_THRESHOLDS = (60, 75, 90)
+_QUALITY_DESCRIPTIONS = (
+    "❌ Very Short (under 1min, much more needed)",
+    "⚠️ Fair (1-1.25min, needs improvement)",
+    "🌟 Good (1.25-1.5min, try for 1.5min+)",
+    "✅ Excellent (1.5min+ target reached!)",
+)
+
+
 def get_quality_description(duration):
     """
     음성 길이에 따른 품질 설명 반환 (1-2분 목표 기준)
@@ -1190,11 +1571,4 @@ def get_quality_description(duration):
     Returns:
         str: 품질 설명
     """
-    if duration >= 90:
-        return "✅ Excellent (1.5min+ target reached!)"
-    elif duration >= 75:
-        return "🌟 Good (1.25-1.5min, try for 1.5min+)"
-    elif duration >= 60:
-        return "⚠️ Fair (1-1.25min, needs improvement)"
-    else:
-        return "❌ Very Short (under 1min, much more needed)"
\ No newline at end of file
+    return _QUALITY_DESCRIPTIONS[bisect.bisect_right(_QUALITY_THRESHOLDS, duration)]
\ No newline at end of file
@@ -3,11 +3,20 @@ feedback.py
 GPT를 이용한 한국어 학습 피드백 생성 (이중 평가 시스템: 연구용 + 학생용) - STT 검증 및 점수 수정
 """
 
-import openai
 import json
 import time
+import hashlib
+import copy
+import bisect
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import re  # 추가: Simple explanation 레이블 제거용
 import streamlit as st
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 GPT 응답 JSON 파싱에 사용 (C 파서)
+except ImportError:
+    orjson = None
 from config import (
     OPENAI_API_KEY, 
     EXPERIMENT_QUESTION, 
@@ -21,10 +30,161 @@ from config import (
     FEEDBACK_LEVEL,
     GPT_FEEDBACK_MAX_TOKENS,
     GPT_FEEDBACK_MAX_CHARS,
+    GPT_FEEDBACK_MINI_FIRST,
+    GPT_FEEDBACK_RETRY_MODEL,
+    GPT_HEDGE_DELAY,
+    GPT_FIRST_TOKEN_TIMEOUT,
     KST
 )
 
 
+@lru_cache(maxsize=1)
+def _get_openai_client():
+    """
+    OpenAI 클라이언트를 처음 필요할 때 한 번만 생성해 재사용
+    (openai SDK import가 무거워 스크립트 재실행마다 치르지 않도록 지연 import,
+    httpx 연결 풀은 요청 간에 공유)
+    
+    Returns:
+        openai.OpenAI: 클라이언트 (API 키가 없으면 None)
+    """
+    if not OPENAI_API_KEY:
+        return None
+    import openai
+    return openai.OpenAI(api_key=OPENAI_API_KEY)
+
+# 응답 도중 청크 사이 최대 대기 시간(초) - 생성 중 잠깐 멈추는 정상 응답이 끊기지 않도록 첫 토큰 제한보다 넉넉하게
+STREAM_READ_TIMEOUT = 30
+# 같은 입력에 최대한 같은 응답이 오도록 고정 seed 사용 (응답 캐시/재현성)
+GPT_SEED = 42
+
+# JSON 파서 (orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스)
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _json_dumps_text(obj):
+    """dict를 JSON 문자열로 직렬화 (orjson이 있으면 사용, 한글은 이스케이프하지 않음)"""
+    if orjson:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass  # orjson이 처리하지 못하는 키/값(정수 키 등)은 표준 json으로
+    return json.dumps(obj, ensure_ascii=False)
+
+# === 미리 컴파일한 정규식 (호출마다 re 내부 캐시 조회 생략) ===
+# 한국어 문장 구분자: ., !, ?, 요/어요/습니다 뒤의 공백
+_KOREAN_SENT_SPLIT = re.compile(r'([.!?]|(?:요|어요|습니다|세요|해요|이에요|예요)\s*)')
+# 문법 설명 앞의 "Simple explanation:" 레이블
+_EXPLANATION_LABEL_RE = re.compile(r'^(?:simple explanation:)?\s*', re.I)
+# 문법 이슈 "Original: '...' → Fix: '...' 🧠 (💡 Simple explanation:) 설명" 구조 (Fix:/설명 레이블은 선택)
+_GRAMMAR_PARSE_RE = re.compile(
+    r'Original:(?P<orig>[^→]*)→(?:[^🧠]*?Fix:)?(?P<fix>[^🧠]*)'
+    r'(?:🧠\s*(?:(?:💡\s*)?Simple explanation:\s*)?(?P<expl>[^🧠]*))?',
+    re.S
+)
+
+
+# === 설명 키워드 기반 오류 타입 분류 (classify_error_type, 우선순위 순서) ===
+_EXPLANATION_CATEGORY_KEYWORDS = (
+    # 1-1) Tense
+    ("Tense", [
+        "tense", "past tense", "future tense", "present tense",
+        "past", "present", "future", "yesterday", "tomorrow", "now",
+        "wrong tense", "time context", "temporal"
+    ]),
+    # 1-2) Particle  ← 키워드 보강
+    ("Particle", [
+        "particle", "조사", "을/를", "이/가", "은/는", "에/에서", "으로/로", "도",
+        "object marker", "subject marker", "topic marker",
+        "use '을'", "use '를'", "use '이'", "use '가'", "use '은'", "use '는'",
+        "mark the object", "mark the subject", "mark the topic",
+        "location marker", "direction marker", "destination"
+    ]),
+    # 1-3) Verb Ending (어미/높임/경어/말끝)
+    ("Verb Ending", [
+        "ending", "verb ending", "conjugation", "politeness",
+        "speech level", "speech style ", "speech consistency" "formality", "해요", "합니다", "자연스러운 어미"
+    ]),
+    # 1-4) Word Order
+    ("Word Order", [
+        "word order", "어순", "order", "position", "placement", "Place"
+        "reorder", "more natural word order", "sov", "comes before", "comes after"
+    ]),
+    # 1-5) Connectives
+    ("Connectives", [
+        "connective", "연결", "transition", "connecting word", "connect"
+        "use '그래서'", "use '그리고'", "use '그런데'", "use '하지만'", "use '또'"
+    ]),
+)
+# 카테고리마다 키워드를 하나의 정규식으로 묶어 한 번에 검색 (키워드별 substring 검사 대신)
+_EXPLANATION_CATEGORY_RES = tuple(
+    (error_type, re.compile("|".join(map(re.escape, keywords))))
+    for error_type, keywords in _EXPLANATION_CATEGORY_KEYWORDS
+)
+# 설명이 없을 때 사용하는 라벨 fallback (우선순위 순서, 대소문자 무시로 lower() 복사 생략)
+_FALLBACK_LABEL_RES = (
+    ("Tense", re.compile(r"tense", re.I)),
+    ("Particle", re.compile(r"particle", re.I)),
+    ("Verb Ending", re.compile(r"ending|verb form", re.I)),
+    ("Word Order", re.compile(r"order", re.I)),
+    ("Connectives", re.compile(r"connective", re.I)),
+)
+
+
+# === GPT 응답 캐시 (같은 프롬프트 재요청 시 API 호출 생략) ===
+# 낮은 temperature(≤0.1)의 결정적 요청만 캐시하며, 파싱에 성공한 원문 응답만 저장
+RESPONSE_CACHE_TTL = 1800  # 30분
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.1
+RESPONSE_CACHE_MAX_ENTRIES = 256  # 초과 시 가장 오래 저장된 응답부터 제거 (장시간 실행되는 프로세스 메모리 제한)
+# 메모리에만 보관 (응답에 참가자 발화가 인용되므로 디스크에 남기지 않음 - 데이터 보존/삭제 정책 밖)
+# 저장 순서 = 저장 시각 순서 (같은 키를 다시 저장하면 맨 뒤로 이동)
+_RESPONSE_CACHE = OrderedDict()
+
+
+def _response_cache_key(model, system_prompt, prompt, temperature):
+    """모델/시스템 프롬프트/프롬프트/temperature로 캐시 키 생성"""
+    payload = json.dumps(
+        {"model": model, "sys": system_prompt, "prompt": prompt, "temp": temperature},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _messages_cache_key(model, messages, temperature):
+    """chat 메시지 목록(system + user...)으로 캐시 키 생성 (실시간 경로와 Batch API 결과가 같은 키를 사용)"""
+    return _response_cache_key(
+        model, messages[0]["content"], "\n".join(m["content"] for m in messages[1:]), temperature
+    )
+
+
+def _get_cached_response(cache_key):
+    """캐시된 GPT 원문 응답 반환 (없거나 만료되면 None)"""
+    entry = _RESPONSE_CACHE.get(cache_key)
+    if entry is None:
+        return None
+    raw_content, stored_at = entry
+    if time.time() - stored_at <= RESPONSE_CACHE_TTL:
+        return raw_content
+    _RESPONSE_CACHE.pop(cache_key, None)
+    return None
+
+
+def _store_cached_response(cache_key, raw_content, temperature):
+    """결정적 요청의 GPT 원문 응답을 메모리 캐시에 저장 (만료된 응답 정리 + 최대 개수 유지)"""
+    if temperature > RESPONSE_CACHE_MAX_TEMPERATURE:
+        return
+    now = time.time()
+    _RESPONSE_CACHE.pop(cache_key, None)
+    _RESPONSE_CACHE[cache_key] = (raw_content, now)
+    
+    # 🔥 오래된 것부터 확인하므로 만료되지 않은 첫 항목에서 중단
+    while _RESPONSE_CACHE:
+        oldest_key, (_, stored_at) = next(iter(_RESPONSE_CACHE.items()))
+        if now - stored_at <= RESPONSE_CACHE_TTL and len(_RESPONSE_CACHE) <= RESPONSE_CACHE_MAX_ENTRIES:
+            break
+        del _RESPONSE_CACHE[oldest_key]
+
+
 def generate_encouraging_feedback_message(word_count, error_rate, duration_s, score):
     """격려적인 피드백 메시지 생성 (60-120초 기준)"""
     messages = []
@@ -82,58 +242,63 @@ def generate_improvement_areas(research_scores, original_feedback):
     return areas[:3]  # 최대 3개
 
 
+# === 점수/길이/정확성/유창성 구간별 메시지 표 (경계값 오름차순 + 구간별 메시지) ===
+# 점수·길이·단어 수는 "경계값 이상"이면 위 구간 (bisect_right)
+_ENCOURAGEMENT_THRESHOLDS = (5, 6, 7, 8)
+_ENCOURAGEMENT_MESSAGES = (
+    "Great start! Keep practicing - you can do it! 🌱",
+    "You're learning well! Every practice helps! 📚",
+    "Good job! Keep practicing and you'll improve! 🚀",
+    "Great progress! You're almost there! 💪",
+    "Outstanding work! You're interview-ready! 🌟",
+)
+_DURATION_THRESHOLDS = (60, 75, 90)
+_DURATION_FEEDBACK_TEMPLATES = (
+    "Too short at {:.1f} seconds. Much more needed for good score!",
+    "Fair length at {:.1f} seconds. Aim for 90+ seconds!",
+    "Good length at {:.1f} seconds. Try for 90+ next time!",
+    "Perfect! {:.1f} seconds meets the 60-120 seconds goal!",
+)
+# 오류율은 "경계값 이하"이면 아래 구간 (bisect_left)
+_ACCURACY_THRESHOLDS = (5, 10, 20)
+_ACCURACY_FEEDBACK_MESSAGES = (
+    "Excellent grammar accuracy!",
+    "Good accuracy with minor errors.",
+    "Fair accuracy - focus on common mistakes.",
+    "Work on grammar basics - you're improving!",
+)
+_FLUENCY_THRESHOLDS = (60, 90, 120)
+_FLUENCY_FEEDBACK_TEMPLATES = (
+    "Work on speaking more - only {} words used.",
+    "Fair fluency with {} words - add more details!",
+    "Good fluency with {} words.",
+    "Excellent fluency with {} words!",
+)
+
+
 def generate_encouragement_message(score):
     """점수 기반 격려 메시지"""
-    if score >= 8:
-        return "Outstanding work! You're interview-ready! 🌟"
-    elif score >= 7:
-        return "Great progress! You're almost there! 💪"
-    elif score >= 6:
-        return "Good job! Keep practicing and you'll improve! 🚀"
-    elif score >= 5:
-        return "You're learning well! Every practice helps! 📚"
-    else:
-        return "Great start! Keep practicing - you can do it! 🌱"
+    return _ENCOURAGEMENT_MESSAGES[bisect.bisect_right(_ENCOURAGEMENT_THRESHOLDS, score)]
 
 
 def generate_duration_feedback(duration_s):
     """녹음 길이 기반 피드백 (60-120초 기준)"""
-    if duration_s >= 90:
-        return f"Perfect! {duration_s:.1f} seconds meets the 60-120 seconds goal!"
-    elif duration_s >= 75:
-        return f"Good length at {duration_s:.1f} seconds. Try for 90+ next time!"
-    elif duration_s >= 60:
-        return f"Fair length at {duration_s:.1f} seconds. Aim for 90+ seconds!"
-    else:
-        return f"Too short at {duration_s:.1f} seconds. Much more needed for good score!"
+    return _DURATION_FEEDBACK_TEMPLATES[bisect.bisect_right(_DURATION_THRESHOLDS, duration_s)].format(duration_s)
 
 
 def generate_accuracy_feedback(error_rate):
     """정확성 기반 피드백"""
-    if error_rate <= 5:
-        return "Excellent grammar accuracy!"
-    elif error_rate <= 10:
-        return "Good accuracy with minor errors."
-    elif error_rate <= 20:
-        return "Fair accuracy - focus on common mistakes."
-    else:
-        return "Work on grammar basics - you're improving!"
+    return _ACCURACY_FEEDBACK_MESSAGES[bisect.bisect_left(_ACCURACY_THRESHOLDS, error_rate)]
 
 
 def generate_fluency_feedback(word_count):
     """유창성 기반 피드백 (60-120초 기준)"""
-    if word_count >= 120:
-        return f"Excellent fluency with {word_count} words!"
-    elif word_count >= 90:
-        return f"Good fluency with {word_count} words."
-    elif word_count >= 60:
-        return f"Fair fluency with {word_count} words - add more details!"
-    else:
-        return f"Work on speaking more - only {word_count} words used."
+    return _FLUENCY_FEEDBACK_TEMPLATES[bisect.bisect_right(_FLUENCY_THRESHOLDS, word_count)].format(word_count)
 
 
 # === 기존 함수들 (수정 없음) ===
 
+@lru_cache(maxsize=64)
 def split_korean_sentences(text):
     """
     한국어 문장을 적절히 분할
@@ -142,25 +307,18 @@ def split_korean_sentences(text):
         text: 분할할 텍스트
         
     Returns:
-        list: 분할된 문장들
+        tuple: 분할된 문장들 (같은 텍스트는 캐시된 결과를 공유하므로 읽기 전용)
     """
-    # 한국어 문장 구분자: ., !, ?, 요/어요/습니다 뒤의 공백
-    pattern = r'([.!?]|(?:요|어요|습니다|세요|해요|이에요|예요)\s*)'
-    sentences = re.split(pattern, text)
+    sentences = _KOREAN_SENT_SPLIT.split(text)
     
-    # 분할된 부분을 다시 조합
-    result = []
-    for i in range(0, len(sentences)-1, 2):
-        if i+1 < len(sentences):
-            sentence = sentences[i] + sentences[i+1]
-            if sentence.strip():
-                result.append(sentence.strip())
+    # 분할된 부분(문장 + 구분자)을 다시 조합
+    pieces = [body + ending for body, ending in zip(sentences[0::2], sentences[1::2])]
     
     # 마지막 부분이 남아있다면 추가
-    if len(sentences) % 2 == 1 and sentences[-1].strip():
-        result.append(sentences[-1].strip())
+    if len(sentences) % 2 == 1:
+        pieces.append(sentences[-1])
     
-    return [s for s in result if len(s.strip()) > 3]  # 너무 짧은 문장 제외
+    return tuple(s for s in map(str.strip, pieces) if len(s) > 3)  # 너무 짧은 문장 제외
 
 
 def preprocess_long_transcript_fallback(transcript, max_chars=GPT_FEEDBACK_MAX_CHARS):
@@ -187,18 +345,20 @@ def preprocess_long_transcript_fallback(transcript, max_chars=GPT_FEEDBACK_MAX_C
             cutoff = max_chars
         return transcript[:cutoff]
     
-    # 문장 단위로 최대한 포함
-    result = ""
+    # 문장 단위로 최대한 포함 (길이만 누적하고 마지막에 한 번만 join)
+    selected = []
+    total = 0
     for sentence in sentences:
-        temp = result + " " + sentence if result else sentence
-        if len(temp) <= max_chars:
-            result = temp
-        else:
+        added = len(sentence) + (1 if selected else 0)
+        if total + added > max_chars:
             break
+        selected.append(sentence)
+        total += added
     
-    return result if result else sentences[0][:max_chars]
+    return " ".join(selected) if selected else sentences[0][:max_chars]
 
 
+@lru_cache(maxsize=64)
 def preprocess_long_transcript(transcript):
     """
     긴 전사 텍스트 전처리 메인 함수 (문자 수 기반만 사용)
@@ -223,74 +383,60 @@ def preprocess_long_transcript(transcript):
         return preprocess_long_transcript_fallback(cleaned)
 
 
-def classify_error_type(issue_text):
+@lru_cache(maxsize=256)
+def _parse_grammar_issue(issue_text):
     """
-    설명(🧠/💡)을 우선 분석해 오류 타입 분류
-    - Particle, Verb Ending, Tense, Word Order, Connectives
-    - 설명이 없을 때만 라벨/문자열 fallback
+    문법 이슈 문자열을 한 번만 분석해 분류/표준화에서 함께 사용
+    
+    Args:
+        issue_text: GPT가 반환한 문법 이슈 문자열
+        
+    Returns:
+        tuple: (original, fix, explanation, 분류용 소문자 설명 - 설명 블록이 없으면 None)
     """
-    issue_lower = issue_text.lower()
-
-    # 1) 설명 블록 추출: 💡 또는 🧠 모두 허용
+    original_text = ""
+    fix_text = ""
+    explanation = ""
+    
+    # Original → (Fix:) → 🧠 설명을 정규식 한 번으로 추출
+    match = _GRAMMAR_PARSE_RE.search(issue_text)
+    if match:
+        original_text = match.group('orig').strip().strip("'\"")
+        fix_text = match.group('fix').strip().strip("'\"")
+        # "Simple explanation:" 레이블은 정규식에서 이미 제외됨
+        explanation = (match.group('expl') or "").strip()
+    
+    # 분류용 설명 블록: 💡 또는 🧠 뒤 전체 (Original 형식이 아니어도 사용)
     exp_block = None
     if "💡" in issue_text:
         exp_block = issue_text.split("💡", 1)[1]
     elif "🧠" in issue_text:
         exp_block = issue_text.split("🧠", 1)[1]
+    classify_text = _EXPLANATION_LABEL_RE.sub('', exp_block).lower() if exp_block else None
+    
+    return original_text, fix_text, explanation, classify_text
 
-    if exp_block:
-        explanation = re.sub(r'^(?:simple explanation:)?\s*', '', exp_block, flags=re.I).lower()
-
-        # 1-1) Tense
-        if any(k in explanation for k in [
-            "tense", "past tense", "future tense", "present tense",
-            "past", "present", "future", "yesterday", "tomorrow", "now",
-            "wrong tense", "time context", "temporal"
-        ]):
-            return "Tense"
-
-        # 1-2) Particle  ← 키워드 보강
-        if any(k in explanation for k in [
-            "particle", "조사", "을/를", "이/가", "은/는", "에/에서", "으로/로", "도",
-            "object marker", "subject marker", "topic marker",
-            "use '을'", "use '를'", "use '이'", "use '가'", "use '은'", "use '는'",
-            "mark the object", "mark the subject", "mark the topic",
-            "location marker", "direction marker", "destination"
-        ]):
-            return "Particle"
-
-        # 1-3) Verb Ending (어미/높임/경어/말끝)
-        if any(k in explanation for k in [
-            "ending", "verb ending", "conjugation", "politeness",
-            "speech level", "speech style ", "speech consistency" "formality", "해요", "합니다", "자연스러운 어미"
-        ]):
-            return "Verb Ending"
-
-        # 1-4) Word Order
-        if any(k in explanation for k in [
-            "word order", "어순", "order", "position", "placement", "Place"
-            "reorder", "more natural word order", "sov", "comes before", "comes after"
-        ]):
-            return "Word Order"
-
-        # 1-5) Connectives
-        if any(k in explanation for k in [
-            "connective", "연결", "transition", "connecting word", "connect"
-            "use '그래서'", "use '그리고'", "use '그런데'", "use '하지만'", "use '또'"
-        ]):
-            return "Connectives"
+
+@lru_cache(maxsize=512)
+def classify_error_type(issue_text):
+    """
+    설명(🧠/💡)을 우선 분석해 오류 타입 분류
+    - Particle, Verb Ending, Tense, Word Order, Connectives
+    - 설명이 없을 때만 라벨/문자열 fallback
+    """
+    # 1) 설명 블록 (💡 또는 🧠 모두 허용 - standardize_grammar_issue와 같은 분석 결과 공유)
+    explanation = _parse_grammar_issue(issue_text)[3]
+
+    if explanation is not None:
+        # 1-1) ~ 1-5) 우선순위 순서대로 카테고리별 키워드 정규식 검사
+        for error_type, keyword_re in _EXPLANATION_CATEGORY_RES:
+            if keyword_re.search(explanation):
+                return error_type
 
     # 2) 설명이 없을 때만 fallback (라벨/문자열 스캔)
-    if "tense" in issue_lower:
-        return "Tense"
-    if "particle" in issue_lower:
-        return "Particle"
-    if "ending" in issue_lower or "verb form" in issue_lower:
-        return "Verb Ending"
-    if "order" in issue_lower:
-        return "Word Order"
-    if "connective" in issue_lower or "connectives" in issue_lower:
-        return "Connectives"
+    for error_type, label_re in _FALLBACK_LABEL_RES:
+        if label_re.search(issue_text):
+            return error_type
 
     return "Others"
 
@@ -310,7 +456,8 @@ def extract_grammar_corrections(grammar_issues):
     
     for issue in grammar_issues:
         if isinstance(issue, str) and '|' in issue:
-            parts = issue.split('|')
+            # "error_type|original|fix|explanation" - 설명 부분은 나누지 않음
+            parts = issue.split('|', 3)
             if len(parts) >= 3:
                 original = parts[1].strip().strip("'\"")
                 fix = parts[2].strip().strip("'\"")
@@ -320,19 +467,20 @@ def extract_grammar_corrections(grammar_issues):
     return corrections
 
 
-def extract_vs_words_from_vocabulary(vocab_suggestions):
+def extract_vs_pairs_per_item(vocab_suggestions):
     """
-    vs 방식 어휘 제안에서 단어들 추출
+    vs 방식 어휘 제안마다 단어 쌍 추출 (제안 목록과 같은 순서/길이)
     
     Args:
         vocab_suggestions: 어휘 제안 리스트 (vs 방식)
         
     Returns:
-        list: [(word_a, word_b), ...] 형태의 단어 쌍들
+        list: 제안별 [(word_a, word_b), ...] 리스트
     """
-    vs_pairs = []
+    pairs_per_item = []
     
     for suggestion in vocab_suggestions:
+        vs_pairs = []
         if "❓ **" in suggestion and " vs " in suggestion:
             try:
                 # ❓ **공부하다 vs 배우다** 부분 추출
@@ -348,9 +496,23 @@ def extract_vs_words_from_vocabulary(vocab_suggestions):
                                 vs_pairs.append((word_a.lower(), word_b.lower()))
                         break
             except:
-                continue
+                pass
+        pairs_per_item.append(vs_pairs)
     
-    return vs_pairs
+    return pairs_per_item
+
+
+def extract_vs_words_from_vocabulary(vocab_suggestions):
+    """
+    vs 방식 어휘 제안에서 단어들 추출
+    
+    Args:
+        vocab_suggestions: 어휘 제안 리스트 (vs 방식)
+        
+    Returns:
+        list: [(word_a, word_b), ...] 형태의 단어 쌍들
+    """
+    return [pair for pairs in extract_vs_pairs_per_item(vocab_suggestions) for pair in pairs]
 
 
 def filter_grammar_from_vocabulary(vocab_suggestions, grammar_issues):
@@ -367,45 +529,43 @@ def filter_grammar_from_vocabulary(vocab_suggestions, grammar_issues):
     # 문법 피드백에서 실제 수정된 내용들 추출
     grammar_corrections = extract_grammar_corrections(grammar_issues)
     
-    # vs 어휘 제안에서 단어 쌍들 추출
-    vs_word_pairs = extract_vs_words_from_vocabulary(vocab_suggestions)
+    # 비교할 문법 수정이 없으면 어휘 팁을 파싱할 필요 없이 전부 유지
+    if not grammar_corrections:
+        return list(vocab_suggestions)
     
-    filtered = []
-    for vocab_tip in vocab_suggestions:
-        is_duplicate = False
-        
-        # 이 어휘 팁의 단어 쌍 찾기
-        current_vs_pairs = extract_vs_words_from_vocabulary([vocab_tip])
-        
-        for word_a, word_b in current_vs_pairs:
-            # 문법 수정 내용과 비교
-            for grammar_old, grammar_new in grammar_corrections:
-                # 어휘 팁의 단어들이 문법 수정에 포함되어 있는지 확인
-                if ((word_a in grammar_old or grammar_old in word_a) and 
-                    (word_b in grammar_new or grammar_new in word_b)) or \
-                   ((word_b in grammar_old or grammar_old in word_b) and 
-                    (word_a in grammar_new or grammar_new in word_a)):
-                    is_duplicate = True
-                    break
-            
-            if is_duplicate:
-                break
-        
-        # 중복이 아닌 경우만 포함
-        if not is_duplicate:
-            filtered.append(vocab_tip)
+    # vs 어휘 제안마다 단어 쌍들을 한 번에 추출 (팁 순서와 동일)
+    pairs_per_tip = extract_vs_pairs_per_item(vocab_suggestions)
     
-    return filtered
+    # 중복이 아닌 팁만 포함 (어휘 팁의 단어 쌍이 문법 수정 중 하나라도 겹치면 제외)
+    return [
+        vocab_tip
+        for vocab_tip, current_vs_pairs in zip(vocab_suggestions, pairs_per_tip)
+        if not any(
+            _vs_pair_matches_correction(word_a, word_b, grammar_old, grammar_new)
+            for word_a, word_b in current_vs_pairs
+            for grammar_old, grammar_new in grammar_corrections
+        )
+    ]
 
 
+def _vs_pair_matches_correction(word_a, word_b, grammar_old, grammar_new):
+    """어휘 팁의 단어 쌍이 문법 수정(원문 → 수정)과 같은 내용인지 확인 (순서 무관, 부분 문자열 허용)"""
+    return ((word_a in grammar_old or grammar_old in word_a) and
+            (word_b in grammar_new or grammar_new in word_b)) or \
+           ((word_b in grammar_old or grammar_old in word_b) and
+            (word_a in grammar_new or grammar_new in word_a))
+
+
+@lru_cache(maxsize=1)
 def get_default_vocabulary_suggestions():
     """
     🔥 vs 방식 기본 어휘 제안 (단어 비교 교육)
+    캐시된 tuple을 공유하므로 수정이 필요하면 list()로 복사해서 사용
     """
-    return [
+    return (
         "❓ **공부하다 vs 배우다**\\n💡 공부하다: Academic studying or reviewing material at a desk\\n💡 배우다: Learning new skills or acquiring new knowledge\\n🟢 시험을 위해 공부해요 (I study for exams) / 한국어를 배우고 있어요 (I'm learning Korean)\\n📝 Use '배우다' for new skills, '공부하다' for reviewing",
         "❓ **좋다 vs 좋아하다**\\n💡 좋다: Adjective - something is good (state/quality)\\n💡 좋아하다: Verb - to like something (preference)\\n🟢 날씨가 좋아요 (The weather is nice) / 음악을 좋아해요 (I like music)\\n📝 Use '이/가 좋다' vs '을/를 좋아하다'"
-    ]
+    )
 
 
 def ensure_required_fields(data, required_fields):
@@ -427,9 +587,8 @@ def generate_prompt(template, **kwargs):
 
 
 # === 🔥 개선된 피드백 프롬프트 템플릿 (문장 연결 팁 추가 + 자연스러운 변형 허용) ===
-IMPROVED_FEEDBACK_PROMPT_TEMPLATE = """Analyze this Korean speaking response from a beginner student.
-
-Student answered "{question}": {transcript}
+# 🔥 고정 지침을 앞에, 학생 답변/발화 시간은 맨 끝에 배치 (OpenAI 프롬프트 prefix 캐시 적중용)
+IMPROVED_FEEDBACK_PROMPT_TEMPLATE = """Analyze the Korean speaking response from a beginner student given in the next message.
 
 **IMPORTANT GUIDELINES:**
 1. Be encouraging and positive - these are beginners learning Korean
@@ -574,8 +733,596 @@ Make this the FIRST point in "Key Improvements".
     "detailed_feedback": "🚩 Task Completion Check\\n- [✅/❌] Past vacation: [Covered well/Partially covered/Missing] - [specific comment]\\n- [✅/❌] Future plans: [Covered well/Partially covered/Missing] - [specific comment]\\n- ⚠️ Tense usage: [comment on past/future tense accuracy]\\n\\n🌟 What You Did Well\\n- [specific praise point 1 with example from their answer]\\n- [specific praise point 2] Great job! 😊 잘 이야기했어요! 👏\\n\\n🎯 Things to Improve\\n- [if missing topic: 'You need to answer BOTH parts: 지난 방학 AND 다음 방학']\\n- [specific grammar issue with concrete example: 'Instead of X, try Y']\\n- [specific content suggestion with example]\\n\\n📝 Try This Next Time\\n1. [Always check: Did I answer ALL parts of the question?]\\n2. [actionable tip 2]\\n3. [actionable tip 3]"
 }}
 
+**IMPORTANT TONE GUIDANCE - SPEAK DIRECTLY TO THE STUDENT:**
+- Always use "You" instead of "The student" 
+- Write feedback as if you're a warm Korean teacher talking directly to the student
+
 """
 
+# 요청마다 달라지는 부분 (프롬프트 맨 끝에 붙임)
+# 🔥 지침 메시지는 설정값(목표 레벨/말투)만 채우면 고정이므로 모듈 로드 시 한 번만 생성
+FEEDBACK_INSTRUCTIONS = generate_prompt(IMPROVED_FEEDBACK_PROMPT_TEMPLATE)
+
+# 🔥 학생 답변/발화 시간은 별도 user 메시지로 전송 (지침 템플릿과 매번 이어 붙이지 않음)
+FEEDBACK_STUDENT_RESPONSE_TEMPLATE = """**STUDENT RESPONSE:**
+Student answered "{question}": {transcript}
+
+**STUDENT SPEAKING DURATION:** {duration:.1f} seconds
+
+Use the actual duration ({duration:.1f}s) when generating your feedback and scoring."""
+
+# 프롬프트 캐시 라우팅 키 (모든 피드백 요청이 같은 고정 prefix를 공유)
+FEEDBACK_PROMPT_CACHE_KEY = "korean-speaking-feedback"
+
+
+def _json_object_closed(delta, state):
+    """
+    스트리밍 조각을 이어 받으며 최상위 JSON 객체가 닫혔는지 확인 (문자열 안의 괄호는 무시)
+    
+    Args:
+        delta: 새로 받은 텍스트 조각
+        state: 조각 사이에 유지되는 스캔 상태 dict ('depth', 'in_string', 'escaped')
+        
+    Returns:
+        bool: 최상위 '}'까지 받았으면 True
+    """
+    for ch in delta:
+        if state['in_string']:
+            if state['escaped']:
+                state['escaped'] = False
+            elif ch == '\\':
+                state['escaped'] = True
+            elif ch == '"':
+                state['in_string'] = False
+        elif ch == '"':
+            state['in_string'] = True
+        elif ch == '{':
+            state['depth'] += 1
+        elif ch == '}':
+            state['depth'] -= 1
+            if state['depth'] == 0:
+                return True
+    return False
+
+
+def _stream_completion_text(client, total_timeout, first_token_timeout, progress, **request_kwargs):
+    """
+    (작업 스레드용) GPT 응답을 스트리밍으로 받아 전체 텍스트 반환 - st.* 호출 없음
+    
+    Args:
+        client: OpenAI 클라이언트
+        total_timeout: 전체 응답 수신 제한 시간 (초)
+        first_token_timeout: 연결 대기 제한 시간 (초) - 첫 토큰 제한은 stream_chat_completion이 따로 확인
+        progress: 진행 상황 공유 dict ('chars' 갱신, 'cancelled'가 True면 중단, 'stream'에 응답 스트림 공유)
+        **request_kwargs: chat.completions.create 인자
+        
+    Returns:
+        str: 응답 전체 텍스트
+    """
+    import openai
+    # 🔥 연결 제한은 첫 토큰 제한과 맞추고, 청크 사이 읽기 제한은 별도로 넉넉하게
+    # (포기한 요청은 _cancel_stream_request가 연결을 닫으므로 읽기 제한까지 스레드를 붙잡지 않음)
+    timeout = request_kwargs.get('timeout', total_timeout)
+    request_kwargs['timeout'] = openai.Timeout(
+        timeout,
+        connect=first_token_timeout,
+        read=min(STREAM_READ_TIMEOUT, timeout)
+    )
+    chunks = []
+    deadline = time.monotonic() + total_timeout
+    # 🔥 JSON 모드면 최상위 객체가 닫히는 즉시 수신 종료 (남은 공백/종료 청크를 기다리지 않음)
+    json_state = None
+    if (request_kwargs.get('response_format') or {}).get('type') == 'json_object':
+        json_state = {'depth': 0, 'in_string': False, 'escaped': False}
+    stream = client.chat.completions.create(stream=True, **request_kwargs)
+    progress['stream'] = stream
+    if progress.get('cancelled'):
+        stream.close()
+        return ""
+    try:
+        for chunk in stream:
+            if progress.get('cancelled'):
+                break
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    chunks.append(delta)
+                    progress['chars'] += len(delta)
+                    if json_state is not None and _json_object_closed(delta, json_state):
+                        break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Response not completed within {total_timeout}s")
+    finally:
+        stream.close()
+    
+    return "".join(chunks).strip()
+
+
+class FirstTokenTimeout(TimeoutError):
+    """첫 토큰 제한 시간 안에 응답이 시작되지 않은 요청 (멈춘 연결 - 다시 보내면 성공할 수 있음)"""
+
+
+def _cancel_stream_request(progress):
+    """진행 중인 스트리밍 요청 중단 (작업 스레드가 다음 청크를 기다리지 않도록 응답 연결을 바로 닫음)"""
+    progress['cancelled'] = True
+    stream = progress.get('stream')
+    if stream is not None:
+        try:
+            stream.close()
+        except Exception:
+            pass  # 이미 닫혔거나 작업 스레드가 닫는 중
+
+
+def stream_chat_completion(client, total_timeout=60, hedge_delay=GPT_HEDGE_DELAY,
+                           first_token_timeout=GPT_FIRST_TOKEN_TIMEOUT, **request_kwargs):
+    """
+    GPT 응답을 스트리밍으로 받아 전체 텍스트 반환 (수신 중 진행 상황 표시)
+    첫 요청이 hedge_delay초 동안 아무 응답도 없으면 같은 요청을 하나 더 보내 먼저 끝난 쪽을 사용
+    first_token_timeout초 안에 첫 토큰이 오지 않은 요청은 실패로 처리 (멈춘 스트림을 끝까지 기다리지 않음)
+    
+    Args:
+        client: OpenAI 클라이언트
+        total_timeout: 전체 응답 수신 제한 시간 (초, 두 번째 요청 포함 호출 전체 기준)
+        hedge_delay: 두 번째 요청을 보내기 전 기다리는 시간 (초)
+        first_token_timeout: 요청별 첫 토큰 대기 제한 시간 (초)
+        **request_kwargs: chat.completions.create 인자
+        
+    Returns:
+        str: 응답 전체 텍스트
+        
+    Raises:
+        FirstTokenTimeout: 모든 요청이 첫 토큰 제한 시간을 넘긴 경우
+        TimeoutError: 전체 제한 시간 안에 응답을 다 받지 못한 경우
+    """
+    placeholder = st.empty()
+    executor = ThreadPoolExecutor(max_workers=2)
+    progresses = {}
+    
+    def submit():
+        progress = {'chars': 0, 'started': time.monotonic()}
+        future = executor.submit(
+            _stream_completion_text, client, total_timeout, first_token_timeout, progress, **request_kwargs
+        )
+        progresses[future] = progress
+        return future
+    
+    pending = {submit()}
+    started = time.monotonic()
+    hedged = False
+    shown = 0
+    last_error = None
+    
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+            
+            # 🔥 첫 토큰 제한 시간을 넘긴 요청은 포기 (아직 보내지 않았다면 대신 같은 요청을 한 번 더 보냄)
+            now = time.monotonic()
+            for future in list(pending):
+                progress = progresses[future]
+                if progress['chars'] == 0 and now - progress['started'] >= first_token_timeout:
+                    _cancel_stream_request(progress)
+                    pending.discard(future)
+                    last_error = FirstTokenTimeout(f"No response token within {first_token_timeout}s")
+                    if not hedged:
+                        pending.add(submit())
+                        hedged = True
+            
+            # 🔥 두 번째 요청을 보냈더라도 호출 전체가 total_timeout을 넘기지 않도록
+            if pending and now - started >= total_timeout:
+                raise TimeoutError(f"Response not completed within {total_timeout}s")
+            
+            received = max(progress['chars'] for progress in progresses.values())
+            # 🔥 첫 요청이 아직 아무것도 받지 못했다면 같은 요청을 한 번 더 보냄 (hedged request)
+            if pending and not hedged and received == 0 and now - started >= hedge_delay:
+                pending.add(submit())
+                hedged = True
+            
+            # 화면 갱신은 약 200자마다 한 번만
+            if received // 200 != shown // 200:
+                placeholder.caption(f"✍️ Writing your feedback... ({received} characters)")
+                shown = received
+        
+        raise last_error
+    finally:
+        placeholder.empty()
+        # 남은 요청은 응답 연결을 닫아 바로 종료
+        for progress in progresses.values():
+            _cancel_stream_request(progress)
+        executor.shutdown(wait=False)
+
+
+def build_feedback_messages(processed_transcript, duration):
+    """
+    피드백 요청 메시지 구성 (시스템 → 고정 지침 → 학생 답변/발화 시간 순서)
+    
+    Args:
+        processed_transcript: 전처리된 전사 텍스트
+        duration: 음성 길이 (초)
+        
+    Returns:
+        list: chat.completions messages
+    """
+    return [
+        {"role": "system", "content": GPT_SYSTEM_PROMPT},
+        {"role": "user", "content": FEEDBACK_INSTRUCTIONS},
+        {"role": "user", "content": FEEDBACK_STUDENT_RESPONSE_TEMPLATE.format(
+            question=EXPERIMENT_QUESTION,
+            transcript=processed_transcript,
+            duration=duration
+        )}
+    ]
+
+
+def build_feedback_request(transcript, duration, model="gpt-4o"):
+    """
+    피드백 요청 본문 구성 (Batch API의 /v1/chat/completions body와 같은 형식)
+    
+    Args:
+        transcript: 전사된 텍스트
+        duration: 음성 길이 (초)
+        model: 사용할 모델
+        
+    Returns:
+        dict: chat completion 요청 본문
+    """
+    if transcript and len(transcript) <= GPT_FEEDBACK_MAX_CHARS:
+        processed_transcript = transcript
+    else:
+        processed_transcript = preprocess_long_transcript(transcript)
+    
+    return {
+        "model": model,
+        "messages": build_feedback_messages(processed_transcript, duration),
+        "temperature": 0.1,
+        "seed": GPT_SEED,
+        "max_tokens": GPT_FEEDBACK_MAX_TOKENS,
+        "response_format": {"type": "json_object"}
+    }
+
+
+# === 🔥 Batch API (연구용 오프라인 재채점 - 실시간 UI는 기존 스트리밍 경로 사용) ===
+def _submit_chat_batch(requests, filename):
+    """
+    (custom_id, 요청 본문) 목록을 JSONL로 업로드하고 Batch API 작업 생성
+    
+    Args:
+        requests: (custom_id, chat completion 요청 본문) 튜플 목록
+        filename: 업로드할 JSONL 파일 이름
+        
+    Returns:
+        str: 배치 작업 ID (실패 시 None)
+    """
+    client = _get_openai_client()
+    if client is None:
+        print("❌ Batch submit skipped: OpenAI API key is not set")
+        return None
+    
+    lines = [
+        _json_dumps_text({
+            "custom_id": str(custom_id),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body
+        })
+        for custom_id, body in requests
+    ]
+    if not lines:
+        return None
+    
+    try:
+        batch_file = client.files.create(
+            file=(filename, "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"✅ Batch submitted: {batch.id} ({len(lines)} requests)")
+        return batch.id
+    except Exception as e:
+        print(f"❌ Batch submit failed: {e}")
+        return None
+
+
+def _read_chat_batch(batch_id):
+    """
+    완료된 배치 작업의 출력 파일을 받아 custom_id별 응답 텍스트로 변환
+    
+    Args:
+        batch_id: 배치 작업 ID
+        
+    Returns:
+        dict: custom_id → 응답 텍스트 (실패한 요청은 None, 아직 완료되지 않았으면 None 반환)
+    """
+    client = _get_openai_client()
+    if client is None:
+        return None
+    
+    batch = client.batches.retrieve(batch_id)
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"⏳ Batch {batch_id}: {batch.status}")
+        return None
+    
+    contents = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = _json_loads(line)
+        response = record.get("response") or {}
+        content = None
+        if response.get("status_code") == 200:
+            content = response["body"]["choices"][0]["message"]["content"]
+        contents[record.get("custom_id")] = content.strip() if content else None
+    return contents
+
+
+def _cache_batch_content(body, content):
+    """배치 응답을 실시간 경로와 같은 키로 응답 캐시에 저장 (이후 같은 요청은 API 호출 생략)"""
+    if content:
+        _store_cached_response(
+            _messages_cache_key(body["model"], body["messages"], body["temperature"]),
+            content, body["temperature"]
+        )
+
+
+def submit_feedback_batch(items, model="gpt-4o"):
+    """
+    여러 답변의 피드백 요청을 하나의 JSONL로 묶어 Batch API 작업으로 제출
+    (요청당 가격 50% 할인, 결과는 최대 24시간 내 수신)
+    
+    Args:
+        items: (session_id, transcript, duration) 튜플 목록
+        model: 사용할 모델
+        
+    Returns:
+        str: 배치 작업 ID (실패 시 None)
+    """
+    return _submit_chat_batch(
+        [(session_id, build_feedback_request(transcript, duration, model))
+         for session_id, transcript, duration in items],
+        "feedback_batch.jsonl"
+    )
+
+
+def collect_feedback_batch(batch_id, items, model="gpt-4o"):
+    """
+    완료된 배치 작업 결과를 받아 피드백 파싱 + 연구용 점수 계산
+    (응답은 응답 캐시에도 저장되어 같은 답변의 실시간 피드백 요청은 API를 다시 호출하지 않음)
+    
+    Args:
+        batch_id: submit_feedback_batch가 반환한 배치 작업 ID
+        items: 제출할 때 사용한 (session_id, transcript, duration) 튜플 목록
+        model: 제출할 때 사용한 모델
+        
+    Returns:
+        dict: session_id → {'feedback', 'research_scores'} (아직 완료되지 않았으면 None)
+    """
+    contents = _read_chat_batch(batch_id)
+    if contents is None:
+        return None
+    
+    results = {}
+    for session_id, transcript, duration in items:
+        session_id = str(session_id)
+        if session_id not in contents:
+            continue
+        
+        content = contents[session_id]
+        feedback = parse_gpt_response(content) if content else None
+        if feedback:
+            _cache_batch_content(build_feedback_request(transcript, duration, model), content)
+        
+        grammar_issues = feedback.get('grammar_issues', []) if feedback else []
+        results[session_id] = {
+            'feedback': feedback,
+            'research_scores': get_research_scores(transcript, grammar_issues, duration)
+        }
+    
+    return results
+
+
+# 한 요청에 묶는 최대 답변 수 (답변당 출력 토큰 한도 × 개수가 모델 출력 한도를 넘지 않도록)
+FEEDBACK_BATCH_MAX_ITEMS = 4
+
+FEEDBACK_BATCH_RESPONSE_TEMPLATE = """Several students answered the same question. Analyze each answer separately using the instructions above.
+Respond with ONE JSON object whose keys are the answer ids below and whose values are the complete feedback JSON object for that answer.
+
+**QUESTION:** "{question}"
+
+**ANSWERS (JSON list of id / transcript / duration in seconds):**
+{answers_json}"""
+
+
+def get_gpt_feedback_batch(items, model="gpt-4o"):
+    """
+    비슷한 시간에 제출된 여러 답변을 하나의 GPT 요청으로 묶어 피드백 생성
+    (고정 지침 prefill을 답변마다 반복하지 않음 - 최대 FEEDBACK_BATCH_MAX_ITEMS개씩)
+    각 답변은 실시간 경로와 같은 이중 평가(_dual_evaluate)를 거침 (세션에는 저장하지 않음)
+    
+    Args:
+        items: (session_id, transcript, duration) 튜플 목록
+        model: 사용할 모델
+        
+    Returns:
+        dict: session_id → {'feedback': 학생용 피드백, 'research_scores'} (응답에 없거나 파싱 실패한 답변은 feedback이 None)
+    """
+    client = _get_openai_client()
+    if client is None:
+        return {}
+    
+    results = {}
+    items = list(items)
+    for start in range(0, len(items), FEEDBACK_BATCH_MAX_ITEMS):
+        group = items[start:start + FEEDBACK_BATCH_MAX_ITEMS]
+        answers = [
+            {
+                "id": str(session_id),
+                "transcript": transcript if transcript and len(transcript) <= GPT_FEEDBACK_MAX_CHARS
+                else preprocess_long_transcript(transcript),
+                "duration": round(duration or 0, 1)
+            }
+            for session_id, transcript, duration in group
+        ]
+        
+        parsed = {}
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": GPT_SYSTEM_PROMPT},
+                    {"role": "user", "content": FEEDBACK_INSTRUCTIONS},
+                    {"role": "user", "content": FEEDBACK_BATCH_RESPONSE_TEMPLATE.format(
+                        question=EXPERIMENT_QUESTION,
+                        answers_json=json.dumps(answers, ensure_ascii=False, indent=1)
+                    )}
+                ],
+                temperature=0.1,
+                seed=GPT_SEED,
+                max_tokens=GPT_FEEDBACK_MAX_TOKENS * len(group),
+                response_format={"type": "json_object"},
+                timeout=120,
+                extra_body={"prompt_cache_key": FEEDBACK_PROMPT_CACHE_KEY}
+            )
+            parsed = _json_loads(response.choices[0].message.content)
+        except Exception as e:
+            print(f"❌ Batched feedback request failed: {e}")
+        
+        for session_id, transcript, duration in group:
+            item_feedback = parsed.get(str(session_id)) if isinstance(parsed, dict) else None
+            if isinstance(item_feedback, dict):
+                research_scores, feedback = _dual_evaluate(
+                    transcript, validate_and_fix_feedback(item_feedback), duration
+                )
+            else:
+                research_scores, feedback = get_research_scores(transcript, [], duration), None
+            results[str(session_id)] = {
+                'feedback': feedback,
+                'research_scores': research_scores
+            }
+    
+    return results
+
+
+# 정규화 전사 캐시: 공백/문장부호 차이만 있는 전사 + 같은 발화 시간(프롬프트와 같은 0.1초 단위)은 같은 응답 재사용
+_TRANSCRIPT_CACHE_NORMALIZE_RE = re.compile(r"[\s.,!?~…]+")
+
+
+def _feedback_transcript_cache_key(model, processed_transcript, duration):
+    """
+    정규화한 전사 + 발화 시간으로 피드백 캐시 키 생성
+    (STT가 문장부호/띄어쓰기만 다르게 낸 재제출도 캐시 적중 - 지침이 바뀌면 키도 바뀜)
+    발화 시간은 프롬프트와 같은 0.1초 단위로만 맞춤 (응답 본문에 실제 초가 인용되므로 구간으로 묶지 않음)
+    
+    Args:
+        model: 사용할 모델
+        processed_transcript: 전처리된 전사 텍스트
+        duration: 음성 길이 (초)
+        
+    Returns:
+        str: 캐시 키
+    """
+    normalized = _TRANSCRIPT_CACHE_NORMALIZE_RE.sub(" ", processed_transcript).strip()
+    return _response_cache_key(
+        model, GPT_SYSTEM_PROMPT, f"{FEEDBACK_INSTRUCTIONS}\n{normalized}\n{round(duration or 0, 1)}", 0.1
+    )
+
+
+def _is_confident_feedback(raw_content):
+    """
+    (mini 우선 모드) mini 응답을 그대로 써도 되는지 판단 - 점수 범위 + 모든 문법 이슈가 정해진 형식인지
+    validate_and_fix_feedback가 기본값으로 채우거나 표준 형식으로 바꾸기 전의 원문 JSON을 검사
+    
+    Args:
+        raw_content: GPT 응답 원문
+        
+    Returns:
+        bool: 확신할 수 있으면 True (False면 gpt-4o로 재요청)
+    """
+    try:
+        feedback = _json_loads(raw_content)
+    except ValueError:
+        return False
+    if not isinstance(feedback, dict) or not feedback.get('suggested_model_sentence'):
+        return False
+    
+    score = feedback.get('interview_readiness_score')
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 1 <= score <= 10:
+        return False
+    
+    # 모든 문법 이슈가 "Original: '...' → Fix: '...'" 형식이고 원문/수정문이 비어 있지 않아야 함
+    issues = feedback.get('grammar_issues', [])
+    if not isinstance(issues, list):
+        return False
+    for issue in issues:
+        if not isinstance(issue, str):
+            return False
+        original_text, fix_text = _parse_grammar_issue(issue)[:2]
+        if not original_text or not fix_text:
+            return False
+    return True
+
+
+def _dual_evaluate(transcript, original_feedback, duration):
+    """
+    이중 평가 계산 (연구용 점수 + 학생용 피드백) - 세션 저장 없음, 실시간/묶음 요청 공용
+    
+    Args:
+        transcript: 전사된 텍스트
+        original_feedback: 파싱된 GPT 피드백
+        duration: 음성 길이 (초)
+        
+    Returns:
+        tuple: (연구용 점수, 학생용 피드백)
+    """
+    # 1. 연구용 점수 계산
+    research_scores = get_research_scores(
+        transcript, 
+        original_feedback.get('grammar_issues', []), 
+        duration
+    )
+    
+    # 2. 학생용 피드백 생성
+    student_feedback = get_student_feedback(
+        transcript, 
+        research_scores, 
+        original_feedback
+    )
+    
+    return research_scores, student_feedback
+
+
+def _apply_dual_evaluation(transcript, original_feedback, duration, debug_info):
+    """
+    GPT 피드백에 이중 평가 시스템 적용 (연구용 점수 계산 + 학생용 피드백 생성 + 세션 저장)
+    
+    Args:
+        transcript: 전사된 텍스트
+        original_feedback: 파싱된 GPT 피드백
+        duration: 음성 길이 (초)
+        debug_info: 세션에 저장할 디버그 정보
+        
+    Returns:
+        dict: 학생용 피드백
+    """
+    research_scores, student_feedback = _dual_evaluate(transcript, original_feedback, duration)
+    
+    # 3. 세션에 연구용 점수 저장
+    st.session_state.research_scores = research_scores
+    
+    # 4. 디버그 정보 저장
+    debug_info['dual_evaluation'] = True
+    st.session_state.gpt_debug_info = debug_info
+    
+    return student_feedback
+
 
 # === 메인 피드백 함수들 (개선된 프롬프트 적용 + STT 검증) ===
 def get_gpt_feedback(transcript, attempt_number=1, duration=0):
@@ -614,76 +1361,70 @@ def get_gpt_feedback(transcript, attempt_number=1, duration=0):
         st.warning("⚠️ No clear speech detected in recording. Using sample feedback.")
         return fb
     
-    # 긴 텍스트 전처리 (문자 수 기반)
-    processed_transcript = preprocess_long_transcript(transcript)
+    # 긴 텍스트 전처리 (문자 수 기반) - 대부분인 짧은 답변은 전처리 호출 자체를 생략
+    if transcript and len(transcript) <= GPT_FEEDBACK_MAX_CHARS:
+        processed_transcript = transcript
+    else:
+        processed_transcript = preprocess_long_transcript(transcript)
     
     # 전처리 결과 로깅
     if len(transcript) != len(processed_transcript):
         st.info(f"📝 Text processed: {len(transcript)} → {len(processed_transcript)} characters for better AI analysis")
     
-    # 🔥 개선된 프롬프트 템플릿 사용
-    enhanced_prompt_template = IMPROVED_FEEDBACK_PROMPT_TEMPLATE + f"""
-
-**STUDENT SPEAKING DURATION:** {duration:.1f} seconds
-
-**IMPORTANT TONE GUIDANCE - SPEAK DIRECTLY TO THE STUDENT:**
-- Always use "You" instead of "The student" 
-- Write feedback as if you're a warm Korean teacher talking directly to the student
-
-
-Use the actual duration ({duration:.1f}s) when generating your feedback and scoring."""
-
-    prompt = generate_prompt(enhanced_prompt_template, question=EXPERIMENT_QUESTION, transcript=processed_transcript)
+    # 🔥 개선된 프롬프트 템플릿 사용 (고정 지침 메시지 → 학생 답변/발화 시간 메시지 순서)
+    messages = build_feedback_messages(processed_transcript, duration)
     debug_info = {
         'attempts': 0, 
-        'errors': []
+        'errors': [],
+        'escalated': False
     }
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    client = _get_openai_client()
     
-    # 2번 시도 (타임아웃 30초로 연장)
-    for attempt in range(2):
+    # 2번 시도 (타임아웃 30초로 연장) - 기본은 gpt-4o → 재시도는 GPT_FEEDBACK_RETRY_MODEL
+    # 🔥 mini 우선 모드: gpt-4o-mini → 실패/불확실한 응답이면 gpt-4o로 재요청
+    models = ("gpt-4o-mini", "gpt-4o") if GPT_FEEDBACK_MINI_FIRST else ("gpt-4o", GPT_FEEDBACK_RETRY_MODEL)
+    uncertain_feedback = None
+    for attempt, model in enumerate(models):
         debug_info['attempts'] = attempt + 1
+        debug_info['model_used'] = model
+        cache_key = _messages_cache_key(model, messages, 0.1)
+        transcript_cache_key = _feedback_transcript_cache_key(model, processed_transcript, duration)
         
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": GPT_SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                timeout=60  # 30초 → 60초로 연장
-            )
-            
-            raw_content = response.choices[0].message.content.strip()
+            # 🔥 같은 프롬프트(→ 정규화 전사)의 이전 응답이 있으면 API 호출 생략
+            raw_content = _get_cached_response(cache_key)
+            if raw_content is None:
+                raw_content = _get_cached_response(transcript_cache_key)
+            if raw_content is None:
+                # 🔥 스트리밍으로 받으면서 진행 상황 표시 (전체 응답을 기다리는 동안 화면이 멈추지 않도록)
+                raw_content = stream_chat_completion(
+                    client,
+                    total_timeout=60,  # 30초 → 60초로 연장
+                    model=model,
+                    messages=messages,
+                    temperature=0.1,
+                    seed=GPT_SEED,
+                    max_tokens=GPT_FEEDBACK_MAX_TOKENS,
+                    response_format={"type": "json_object"},
+                    timeout=60,
+                    extra_body={"prompt_cache_key": FEEDBACK_PROMPT_CACHE_KEY}
+                )
             debug_info['errors'] = []  # 성공시 에러 리스트 초기화
             
             original_feedback = parse_gpt_response(raw_content)
             
             if original_feedback and original_feedback.get('suggested_model_sentence'):
-                # 🎯 이중 평가 시스템 적용
-                
-                # 1. 연구용 점수 계산
-                research_scores = get_research_scores(
-                    transcript, 
-                    original_feedback.get('grammar_issues', []), 
-                    duration
-                )
+                if GPT_FEEDBACK_MINI_FIRST and attempt == 0 and not _is_confident_feedback(raw_content):
+                    # mini 응답은 보관만 하고 gpt-4o로 재요청 (gpt-4o도 실패하면 이 응답 사용)
+                    uncertain_feedback = original_feedback
+                    debug_info['escalated'] = True
+                    continue
                 
-                # 2. 학생용 피드백 생성
-                student_feedback = get_student_feedback(
-                    transcript, 
-                    research_scores, 
-                    original_feedback
-                )
-                
-                # 3. 세션에 연구용 점수 저장
-                st.session_state.research_scores = research_scores
-                
-                # 4. 디버그 정보 저장
-                debug_info['dual_evaluation'] = True
-                st.session_state.gpt_debug_info = debug_info
+                _store_cached_response(cache_key, raw_content, 0.1)
+                _store_cached_response(transcript_cache_key, raw_content, 0.1)
                 
+                # 🎯 이중 평가 시스템 적용
+                student_feedback = _apply_dual_evaluation(transcript, original_feedback, duration, debug_info)
                 st.success("✅ AI feedback ready!")
                 return student_feedback
             else:
@@ -694,14 +1435,22 @@ Use the actual duration ({duration:.1f}s) when generating your feedback and scor
             debug_info['errors'].append(error_msg)
             
             if attempt < 1:
+                # 재시도는 다른 모델로 바로 진행 (대기 없음)
                 st.warning(f"⚠️ AI feedback error, retrying...")
-                time.sleep(0.5)
+    
+    # 🔥 gpt-4o 재요청이 실패했으면 보관한 mini 응답 사용 (기본 피드백보다 나음)
+    if uncertain_feedback is not None:
+        debug_info['model_used'] = models[0]
+        student_feedback = _apply_dual_evaluation(transcript, uncertain_feedback, duration, debug_info)
+        st.success("✅ AI feedback ready!")
+        return student_feedback
     
     # 모든 시도 실패 - fallback 피드백 사용
     st.error("❌ AI feedback failed after 2 attempts")
     st.info("Using basic feedback to continue experiment")
     
     debug_info['errors'].append("All attempts failed - using fallback")
+    debug_info['model_used'] = 'fallback'  # 마지막 시도 모델이 채점한 세션으로 오인되지 않도록
     debug_info['dual_evaluation'] = True
     st.session_state.gpt_debug_info = debug_info
     
@@ -724,9 +1473,19 @@ Use the actual duration ({duration:.1f}s) when generating your feedback and scor
 
 
 def parse_gpt_response(raw_content):
-    """GPT 응답을 JSON으로 파싱"""
+    """
+    GPT 응답을 JSON으로 파싱 (json_object 모드 응답, ```json 코드 블록은 예비 처리)
+    같은 원문(캐시 적중/재시도)은 검증까지 마친 결과를 재사용하고 호출자에게는 복사본 반환
+    """
+    result = _parse_gpt_response_cached(raw_content)
+    return copy.deepcopy(result) if result is not None else None
+
+
+@lru_cache(maxsize=256)
+def _parse_gpt_response_cached(raw_content):
+    """parse_gpt_response 본체 (결과 dict는 캐시에 공유되므로 직접 수정 금지)"""
     try:
-        result = json.loads(raw_content)
+        result = _json_loads(raw_content)
         return validate_and_fix_feedback(result)
     except json.JSONDecodeError:
         try:
@@ -734,7 +1493,7 @@ def parse_gpt_response(raw_content):
                 start = raw_content.find("```json") + 7
                 end = raw_content.find("```", start)
                 clean_content = raw_content[start:end].strip()
-                result = json.loads(clean_content)
+                result = _json_loads(clean_content)
                 return validate_and_fix_feedback(result)
         except:
             pass
@@ -742,48 +1501,61 @@ def parse_gpt_response(raw_content):
     return None
 
 
+# === 피드백 필수 필드 기본값 (vs 방식 어휘팁 + 2인칭 톤 + detailed_feedback + sentence_connection_tip) ===
+_DEFAULT_MODEL_SENTENCE = "지난 방학에는 가족과 함께 제주도로 여행을 갔어요. 아름다운 바다를 보고 맛있는 흑돼지도 먹었어요. 정말 특별한 경험이었어요. 다음 방학에는 한국어 공부를 더 열심히 할 거예요. 한국 문화를 깊이 배우고 싶어서 한국 친구들과 더 많이 대화하고 싶어요."
+_DEFAULT_MODEL_SENTENCE_ENGLISH = "During my last vacation, I went on a trip to Jeju Island with my family. We saw the beautiful ocean and ate delicious black pork. It was truly a special experience. Next vacation, I will study Korean more diligently. I want to learn Korean culture deeply, so I want to have more conversations with Korean friends."
+_DEFAULT_CONTENT_EXPANSION_SUGGESTIONS = (
+    "💬 Topic: Summer vacation details\\n📝 Example: '친구들하고 캠핑도 갔어요. 밤에 별도 보고 바베큐도 했어요.'\\n   'I went camping with friends too. We looked at stars at night and had a barbecue.'",
+    "💬 Topic: Specific plans in Korea\\n📝 Example: '한국 전통 음식을 배우고 싶어요. 김치 만드는 방법도 배울 거예요.'\\n   'I want to learn Korean traditional food. I will also learn how to make kimchi.'"
+)
+_DEFAULT_SENTENCE_CONNECTION_TIP = "🎯 **Tip for Longer Sentences**\\n❌ 바다 갔어요. 수영했어요.\\n✅ 바다에 가서 수영했어요.\\n💡 Use connectives like 그리고, 그래서, -고, -아서/어서 to sound more natural"
+_DEFAULT_DETAILED_FEEDBACK = "🚩 Task Completion Check\\n- ✅ Past vacation: Covered well — You talked about your vacation experiences\\n- ✅ Future plans: Covered well — You mentioned your plans for next vacation\\n- 📌 Detail richness: Good details about activities and reasons\\n- ⚠️ Tense usage: Good use of both past and future tenses\\n\\n..."
+
+# (필드, 기본값 생성 함수) - 값이 비어 있는 필드에 대해서만 생성 (리스트는 매번 새로 만들어 공유 방지)
+_FEEDBACK_REQUIRED_FIELDS = (
+    ("suggested_model_sentence", lambda: _DEFAULT_MODEL_SENTENCE),
+    ("suggested_model_sentence_english", lambda: _DEFAULT_MODEL_SENTENCE_ENGLISH),
+    ("content_expansion_suggestions", lambda: list(_DEFAULT_CONTENT_EXPANSION_SUGGESTIONS)),
+    ("vocabulary_suggestions", lambda: list(get_default_vocabulary_suggestions())),  # 🔥 vs 방식 어휘팁
+    ("fluency_comment", lambda: "Keep practicing to speak more naturally!"),
+    ("interview_readiness_score", lambda: 6),
+    ("sentence_connection_tip", lambda: _DEFAULT_SENTENCE_CONNECTION_TIP),  # 🔥 새로 추가
+    ("detailed_feedback", lambda: _DEFAULT_DETAILED_FEEDBACK),
+    ("encouragement_message", lambda: "Every practice makes you better! You're doing great learning Korean!"),
+)
+
+
+def ensure_required_field_factories(data, field_factories):
+    """필수 필드가 누락된(비어 있는) 경우에만 기본값 생성 함수를 호출해 보완"""
+    for field, make_default in field_factories:
+        if not data.get(field):
+            data[field] = make_default()
+    return data
+
+
 def validate_and_fix_feedback(feedback):
     """피드백 구조를 검증하고 누락된 필수 필드를 추가"""
     
-    # 🔥 필수 필드 기본값 (vs 방식 어휘팁 + 2인칭 톤 + detailed_feedback + sentence_connection_tip)
-    required_fields = {
-        "suggested_model_sentence": "지난 방학에는 가족과 함께 제주도로 여행을 갔어요. 아름다운 바다를 보고 맛있는 흑돼지도 먹었어요. 정말 특별한 경험이었어요. 다음 방학에는 한국어 공부를 더 열심히 할 거예요. 한국 문화를 깊이 배우고 싶어서 한국 친구들과 더 많이 대화하고 싶어요.",
-        "suggested_model_sentence_english": "During my last vacation, I went on a trip to Jeju Island with my family. We saw the beautiful ocean and ate delicious black pork. It was truly a special experience. Next vacation, I will study Korean more diligently. I want to learn Korean culture deeply, so I want to have more conversations with Korean friends.",
-        "content_expansion_suggestions": [
-            "💬 Topic: Summer vacation details\\n📝 Example: '친구들하고 캠핑도 갔어요. 밤에 별도 보고 바베큐도 했어요.'\\n   'I went camping with friends too. We looked at stars at night and had a barbecue.'",
-            "💬 Topic: Specific plans in Korea\\n📝 Example: '한국 전통 음식을 배우고 싶어요. 김치 만드는 방법도 배울 거예요.'\\n   'I want to learn Korean traditional food. I will also learn how to make kimchi.'"
-        ],
-        "vocabulary_suggestions": get_default_vocabulary_suggestions(),  # 🔥 vs 방식 어휘팁
-        "fluency_comment": "Keep practicing to speak more naturally!",
-        "interview_readiness_score": 6,
-        "sentence_connection_tip": "🎯 **Tip for Longer Sentences**\\n❌ 바다 갔어요. 수영했어요.\\n✅ 바다에 가서 수영했어요.\\n💡 Use connectives like 그리고, 그래서, -고, -아서/어서 to sound more natural",  # 🔥 새로 추가
-        "detailed_feedback": "🚩 Task Completion Check\\n- ✅ Past vacation: Covered well — You talked about your vacation experiences\\n- ✅ Future plans: Covered well — You mentioned your plans for next vacation\\n- 📌 Detail richness: Good details about activities and reasons\\n- ⚠️ Tense usage: Good use of both past and future tenses\\n\\n...",
-        "encouragement_message": "Every practice makes you better! You're doing great learning Korean!"
-    }
-
-    
-    feedback = ensure_required_fields(feedback, required_fields)
+    feedback = ensure_required_field_factories(feedback, _FEEDBACK_REQUIRED_FIELDS)
     
     # 🔥 Grammar issues 검증 및 개선 (최대 6개, 모든 오류 표시 + 유형 분류 유지)
     if 'grammar_issues' in feedback and feedback['grammar_issues']:
-        valid_issues = []
-        for i, issue in enumerate(feedback['grammar_issues'][:6]):  # 최대 6개
-            if isinstance(issue, str) and len(issue) > 10:
-                # 🎯 오류 타입 분류 (3개 주요 유형 + 기타)
-                error_type = classify_error_type(issue)
-                if not error_type:  # 3개 유형에 해당하지 않으면
-                    error_type = "Others"  # "Others" 유형으로 분류
-                
-                # 🔥 모든 유효한 문법 오류를 포함 (필터링 제거)
-                standardized_issue = standardize_grammar_issue(issue, error_type)
-                valid_issues.append(standardized_issue)
+        # 최대 6개 중 유효한 문자열 이슈만 모아 한 번에 분류 → 표준화
+        issues = [
+            issue for issue in feedback['grammar_issues'][:6]
+            if isinstance(issue, str) and len(issue) > 10
+        ]
+        # 🎯 오류 타입 분류 (해당 유형이 없으면 classify_error_type이 "Others" 반환)
+        error_types = [classify_error_type(issue) for issue in issues]
+        # 🔥 모든 유효한 문법 오류를 포함 (필터링 제거)
+        valid_issues = list(map(standardize_grammar_issue, issues, error_types))
         
         if valid_issues:
             feedback['grammar_issues'] = valid_issues
         else:
-            feedback['grammar_issues'] = get_default_grammar_issues()
+            feedback['grammar_issues'] = list(get_default_grammar_issues())
     else:
-        feedback['grammar_issues'] = get_default_grammar_issues()
+        feedback['grammar_issues'] = list(get_default_grammar_issues())
     
     # 🔥 Vocabulary suggestions 재구성 (vs 방식 + 스마트 중복 필터링)
     if 'vocabulary_suggestions' in feedback and feedback['vocabulary_suggestions']:
@@ -798,10 +1570,10 @@ def validate_and_fix_feedback(feedback):
             feedback['vocabulary_suggestions'] = filtered_vocab[:2]  # 최대 2개
         else:
             # 모든 어휘 제안이 문법과 중복되어 필터링된 경우 기본값 사용
-            feedback['vocabulary_suggestions'] = get_default_vocabulary_suggestions()
+            feedback['vocabulary_suggestions'] = list(get_default_vocabulary_suggestions())
     else:
         # GPT가 어휘 제안을 생성하지 않았으면 기본값 사용
-        feedback['vocabulary_suggestions'] = get_default_vocabulary_suggestions()
+        feedback['vocabulary_suggestions'] = list(get_default_vocabulary_suggestions())
     
     # 점수 검증
     score = feedback.get("interview_readiness_score", 6)
@@ -811,28 +1583,12 @@ def validate_and_fix_feedback(feedback):
     return feedback
 
 
+@lru_cache(maxsize=512)
 def standardize_grammar_issue(issue_text, error_type):
-    """문법 이슈를 간단한 표준 형식으로 변환"""
+    """문법 이슈를 간단한 표준 형식으로 변환 (순수 함수라 재시도/fallback 경로에서 결과 재사용)"""
     
-    # Original과 Fix 추출
-    original_text = ""
-    fix_text = ""
-    explanation = ""
-    
-    if "Original:" in issue_text and "→" in issue_text:
-        try:
-            original_text = issue_text.split("Original:")[1].split("→")[0].strip().strip("'\"")
-            if "Fix:" in issue_text:
-                fix_text = issue_text.split("Fix:")[1].split("🧠")[0].strip().strip("'\"")
-            else:
-                fix_text = issue_text.split("→")[1].split("🧠")[0].strip().strip("'\"")
-            
-            if "🧠" in issue_text:
-                explanation = issue_text.split("🧠")[1].strip()
-                # "Simple explanation:" 제거
-                explanation = re.sub(r'^(?:💡\s*)?Simple explanation:\s*', '', explanation)
-        except:
-            pass
+    # Original과 Fix 추출 (classify_error_type과 같은 분석 결과 공유)
+    original_text, fix_text, explanation, _ = _parse_grammar_issue(issue_text)
     
     # 간단한 표준 형식으로 구성
     if original_text and fix_text:
@@ -845,87 +1601,126 @@ def standardize_grammar_issue(issue_text, error_type):
         return f"{error_type}||Basic grammar point|Review this grammar carefully"
 
 
+# 오류 타입별 기본 설명 (6개 유형)
+_DEFAULT_EXPLANATIONS = {
+    "Particle": "Use the appropriate particle to mark the grammatical role",
+    "Verb Ending": "Use the correct verb ending form",
+    "Tense": "Use the appropriate tense marker",
+    "Word Order": "Use the correct word order for natural Korean",
+    "Connectives": "Use appropriate connecting expressions",
+    "Others": "Review this grammar point carefully"
+}
+
+
 def get_default_explanation(error_type):
     """오류 타입별 기본 설명 (6개 유형 지원)"""
-    explanations = {
-        "Particle": "Use the appropriate particle to mark the grammatical role",
-        "Verb Ending": "Use the correct verb ending form",
-        "Tense": "Use the appropriate tense marker",
-        "Word Order": "Use the correct word order for natural Korean",
-        "Connectives": "Use appropriate connecting expressions",
-        "Others": "Review this grammar point carefully"
-    }
-    return explanations.get(error_type, "Review this grammar point")
+    return _DEFAULT_EXPLANATIONS.get(error_type, "Review this grammar point")
 
 
+@lru_cache(maxsize=1)
 def get_default_grammar_issues():
-    """기본 문법 이슈들 (5개 주요 유형)"""
-    return [
+    """기본 문법 이슈들 (5개 주요 유형, 공유 tuple - 수정 시 list()로 복사)"""
+    return (
         "Particle|학교를 가요|학교에 가요|Use '에' for destination, not '를'",  # 잘못된 조사 사용으로 변경,
         "Verb Ending|좋아요|좋아해요|Use '좋아해요' when expressing preferences",
         "Tense|어제 가요|어제 갔어요|Use past tense with time indicators like '어제'",
         "Word Order|한국에서 저는 공부해요|저는 한국에서 공부해요|Subject comes before location",
         "Connectives|그리고 그리고 또|그리고... 또한|Avoid repeating the same connector"
-    ]
+    )
+
+
+# API 실패시 사용할 기본 피드백 템플릿 (get_fallback_feedback에서 깊은 복사로 반환)
+_FALLBACK_FEEDBACK_TEMPLATE = {
+    "suggested_model_sentence": "지난 방학에는 가족과 함께 여행을 갔어요. 새로운 도시에서 맛있는 음식도 먹고 사진도 많이 찍었어요. 다음 방학에는 한국어 수업을 들을 거예요. 한국 문화를 더 배우고 싶어서 한국 친구들도 사귀고 싶어요.",
+    "suggested_model_sentence_english": "During my last vacation, I went on a trip with my family. We ate delicious food in a new city and took lots of photos. Next vacation, I will take Korean language classes. I want to learn more about Korean culture, so I want to make Korean friends too.",
+    "grammar_issues": list(get_default_grammar_issues()),
+    "vocabulary_suggestions": list(get_default_vocabulary_suggestions()),  # 🔥 vs 방식 어휘팁 포함
+    "content_expansion_suggestions": [
+        "💬 Topic: Summer vacation details\\n📝 Example: '친구들하고 캠핑도 갔어요. 밤에 별도 보고 바베큐도 했어요.'\\n   'I went camping with friends too. We looked at stars at night and had a barbecue.'",
+        "💬 Topic: Specific plans in Korea\\n📝 Example: '한국 전통 음식을 배우고 싶어요. 김치 만드는 방법도 배울 거예요.'\\n   'I want to learn Korean traditional food. I will also learn how to make kimchi.'"
+    ],
+    "grammar_expression_tip": "🚀 Try: '저는 X를 좋아해요' = 'I like X'\\n📝 Example: '저는 한국 음식을 좋아해요'\\n💡 Use to express preferences",
+    "sentence_connection_tip": "🎯 **Tip for Longer Sentences**\\n❌ 바다 갔어요. 수영했어요.\\n✅ 바다에 가서 수영했어요.\\n💡 Use connectives like 그리고, 그래서, -고, -아서/어서 to sound more natural",  # 🔥 새로 추가
+    "fluency_comment": "Keep practicing! Try to speak for at least 60+ seconds to build fluency.",
+    "interview_readiness_score": 5,  # 🔥 기본 점수는 5점 (STT 검증에서 0으로 오버라이드됨)
+    "detailed_feedback": "🚩 Task Completion Check\\n- ❌ Past vacation: Missing — Please talk about what you did last vacation\\n- ❌ Future plans: Missing — Please talk about your next vacation plans\\n- 📌 Detail richness: Details missing — Add where, with whom, and specific activities\\n- ⚠️ Tense usage: Need to use past tense (갔어요, 했어요) and future tense (할 거예요)\\n\\n...",
+    "encouragement_message": "Every practice session helps! Keep going! 화이팅!"
+}
 
 
 def get_fallback_feedback():
     """API 실패시 사용할 기본 피드백 (60-120초 기준, vs 방식 어휘 제안 포함, 2인칭 톤, detailed_feedback 포함, sentence_connection_tip 추가)"""
-    return {
-        "suggested_model_sentence": "지난 방학에는 가족과 함께 여행을 갔어요. 새로운 도시에서 맛있는 음식도 먹고 사진도 많이 찍었어요. 다음 방학에는 한국어 수업을 들을 거예요. 한국 문화를 더 배우고 싶어서 한국 친구들도 사귀고 싶어요.",
-        "suggested_model_sentence_english": "During my last vacation, I went on a trip with my family. We ate delicious food in a new city and took lots of photos. Next vacation, I will take Korean language classes. I want to learn more about Korean culture, so I want to make Korean friends too.",
-        "grammar_issues": get_default_grammar_issues(),
-        "vocabulary_suggestions": get_default_vocabulary_suggestions(),  # 🔥 vs 방식 어휘팁 포함
-        "content_expansion_suggestions": [
-            "💬 Topic: Summer vacation details\\n📝 Example: '친구들하고 캠핑도 갔어요. 밤에 별도 보고 바베큐도 했어요.'\\n   'I went camping with friends too. We looked at stars at night and had a barbecue.'",
-            "💬 Topic: Specific plans in Korea\\n📝 Example: '한국 전통 음식을 배우고 싶어요. 김치 만드는 방법도 배울 거예요.'\\n   'I want to learn Korean traditional food. I will also learn how to make kimchi.'"
-        ],
-        "grammar_expression_tip": "🚀 Try: '저는 X를 좋아해요' = 'I like X'\\n📝 Example: '저는 한국 음식을 좋아해요'\\n💡 Use to express preferences",
-        "sentence_connection_tip": "🎯 **Tip for Longer Sentences**\\n❌ 바다 갔어요. 수영했어요.\\n✅ 바다에 가서 수영했어요.\\n💡 Use connectives like 그리고, 그래서, -고, -아서/어서 to sound more natural",  # 🔥 새로 추가
-        "fluency_comment": "Keep practicing! Try to speak for at least 60+ seconds to build fluency.",
-        "interview_readiness_score": 5,  # 🔥 기본 점수는 5점 (STT 검증에서 0으로 오버라이드됨)
-        "detailed_feedback": "🚩 Task Completion Check\\n- ❌ Past vacation: Missing — Please talk about what you did last vacation\\n- ❌ Future plans: Missing — Please talk about your next vacation plans\\n- 📌 Detail richness: Details missing — Add where, with whom, and specific activities\\n- ⚠️ Tense usage: Need to use past tense (갔어요, 했어요) and future tense (할 거예요)\\n\\n...",
-        "encouragement_message": "Every practice session helps! Keep going! 화이팅!"
-    }
+    return copy.deepcopy(_FALLBACK_FEEDBACK_TEMPLATE)
 
-def get_improvement_assessment(first_transcript, second_transcript, original_feedback):
-    """STT 기반 루브릭을 사용한 개선도 평가 (2인칭 톤)"""
-    if not OPENAI_API_KEY:
-        return get_fallback_improvement_assessment()
-    
-    # 🔥 개선도 평가 프롬프트에도 2인칭 톤 지침 추가
-    enhanced_improvement_template = IMPROVEMENT_PROMPT_TEMPLATE.replace(
-        "**Task:** Evaluate improvement between attempts. Be encouraging and specific!",
-        """**Task:** Evaluate improvement between attempts. Be encouraging and specific!
+# 🔥 개선도 평가 프롬프트에도 2인칭 톤 지침 추가 (모듈 로드 시 한 번만 치환)
+_ENHANCED_IMPROVEMENT_TEMPLATE = IMPROVEMENT_PROMPT_TEMPLATE.replace(
+    "**Task:** Evaluate improvement between attempts. Be encouraging and specific!",
+    """**Task:** Evaluate improvement between attempts. Be encouraging and specific!
 
 **TONE:** Use "You" (not "The student"). Be encouraging and speak directly to the student as a warm Korean teacher.
 """
-    )
+)
+
+# 개선도 평가 요청의 최대 시도 횟수와 첫 재시도 대기 시간(초, 재시도마다 2배)
+IMPROVEMENT_MAX_ATTEMPTS = 3
+IMPROVEMENT_RETRY_BASE_DELAY = 0.5
+# 개선도 평가 전체 제한 시간 (초, 재시도와 대기 시간 포함 - 기존 단일 요청 제한과 같음)
+IMPROVEMENT_TIMEOUT = 15
+
+
+IMPROVEMENT_SYSTEM_PROMPT = "You are a Korean teacher evaluating progress. Respond only with valid JSON. Always speak directly to the student using 'You' instead of 'The student'."
+
+
+def build_improvement_request(first_transcript, second_transcript, original_feedback, model="gpt-4o"):
+    """
+    개선도 평가 요청 본문 구성 (Batch API의 /v1/chat/completions body와 같은 형식)
     
+    Args:
+        first_transcript: 1차 시도 전사 텍스트
+        second_transcript: 2차 시도 전사 텍스트
+        original_feedback: 1차 시도 피드백
+        model: 사용할 모델
+        
+    Returns:
+        dict: chat completion 요청 본문
+    """
     prompt = generate_prompt(
-        enhanced_improvement_template,
+        _ENHANCED_IMPROVEMENT_TEMPLATE,
         question=EXPERIMENT_QUESTION,
         first_transcript=first_transcript,
         second_transcript=second_transcript,
-        original_feedback=json.dumps(original_feedback, ensure_ascii=False)
+        original_feedback=_json_dumps_text(original_feedback)
     )
     
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": IMPROVEMENT_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.1,
+        "seed": GPT_SEED,
+        "max_tokens": GPT_FEEDBACK_MAX_TOKENS,
+        "response_format": {"type": "json_object"}
+    }
+
+
+def get_improvement_assessment(first_transcript, second_transcript, original_feedback):
+    """STT 기반 루브릭을 사용한 개선도 평가 (2인칭 톤)"""
+    if not OPENAI_API_KEY:
+        return get_fallback_improvement_assessment()
+    
+    request = build_improvement_request(first_transcript, second_transcript, original_feedback)
+    cache_key = _messages_cache_key(request["model"], request["messages"], request["temperature"])
+    
     try:
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a Korean teacher evaluating progress. Respond only with valid JSON. Always speak directly to the student using 'You' instead of 'The student'."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            timeout=15
-        )
-        
-        raw_content = response.choices[0].message.content.strip()
+        raw_content = _get_cached_response(cache_key)
+        if raw_content is None:
+            raw_content = _request_improvement_with_backoff(request)
         result = parse_gpt_response(raw_content)
         
         if result:
+            _store_cached_response(cache_key, raw_content, 0.1)
             return validate_and_fix_improvement(result)
         else:
             raise ValueError("Failed to parse response")
@@ -935,45 +1730,139 @@ def get_improvement_assessment(first_transcript, second_transcript, original_fee
         return get_fallback_improvement_assessment()
 
 
+def submit_improvement_batch(items, model="gpt-4o"):
+    """
+    여러 학생의 개선도 평가 요청을 Batch API 작업으로 제출 (연구용 오프라인 재채점)
+    
+    Args:
+        items: (session_id, first_transcript, second_transcript, original_feedback) 튜플 목록
+        model: 사용할 모델
+        
+    Returns:
+        str: 배치 작업 ID (실패 시 None)
+    """
+    return _submit_chat_batch(
+        [(session_id, build_improvement_request(first, second, original_feedback, model))
+         for session_id, first, second, original_feedback in items],
+        "improvement_batch.jsonl"
+    )
+
+
+def collect_improvement_batch(batch_id, items, model="gpt-4o"):
+    """
+    완료된 개선도 평가 배치 결과를 받아 검증 (응답 캐시에도 저장되어 실시간 평가는 API를 다시 호출하지 않음)
+    
+    Args:
+        batch_id: submit_improvement_batch가 반환한 배치 작업 ID
+        items: 제출할 때 사용한 (session_id, first_transcript, second_transcript, original_feedback) 튜플 목록
+        model: 제출할 때 사용한 모델
+        
+    Returns:
+        dict: session_id → 개선도 평가 (실패한 요청은 기본값, 아직 완료되지 않았으면 None)
+    """
+    contents = _read_chat_batch(batch_id)
+    if contents is None:
+        return None
+    
+    results = {}
+    for session_id, first, second, original_feedback in items:
+        session_id = str(session_id)
+        if session_id not in contents:
+            continue
+        
+        content = contents[session_id]
+        result = parse_gpt_response(content) if content else None
+        if result:
+            _cache_batch_content(build_improvement_request(first, second, original_feedback, model), content)
+            results[session_id] = validate_and_fix_improvement(result)
+        else:
+            results[session_id] = get_fallback_improvement_assessment()
+    
+    return results
+
+
+def _request_improvement_with_backoff(request):
+    """
+    개선도 평가 요청 (속도 제한/연결 오류/첫 토큰 지연만 지수 백오프로 재시도)
+    모든 시도와 대기 시간을 합쳐 IMPROVEMENT_TIMEOUT초를 넘기지 않음
+    
+    Args:
+        request: build_improvement_request가 만든 요청 본문 (캐시 키와 같은 본문을 그대로 전송)
+        
+    Returns:
+        str: 응답 전체 텍스트
+    """
+    import openai
+    # 전체 제한 시간 초과(TimeoutError)는 재시도하지 않음 - 긴 응답은 다시 보내도 같은 시간이 걸림
+    transient_errors = (FirstTokenTimeout, openai.RateLimitError, openai.APIConnectionError)
+    
+    deadline = time.monotonic() + IMPROVEMENT_TIMEOUT
+    delay = IMPROVEMENT_RETRY_BASE_DELAY
+    for attempt in range(IMPROVEMENT_MAX_ATTEMPTS):
+        try:
+            # 🔥 피드백과 같은 스트리밍 + hedged request 경로 사용 (느린 첫 요청을 끝까지 기다리지 않음)
+            return stream_chat_completion(
+                _get_openai_client(),
+                total_timeout=deadline - time.monotonic(),
+                **request
+            )
+        except transient_errors as e:
+            if attempt == IMPROVEMENT_MAX_ATTEMPTS - 1 or time.monotonic() + delay >= deadline:
+                raise
+            print(f"Improvement request retry {attempt + 1} in {delay:.1f}s: {e}")
+            time.sleep(delay)
+            delay *= 2
+
+
+# 개선도 평가 필수 필드 (필드, 기본값 생성 함수) - 누락/빈 값일 때만 생성
+_IMPROVEMENT_REQUIRED_FIELDS = (
+    ("first_attempt_score", lambda: 5),
+    ("second_attempt_score", lambda: 5),
+    ("score_difference", lambda: 0),
+    ("improvement_score", lambda: 5),
+    ("improvement_reason", lambda: "Continue practicing for better fluency and accuracy"),
+    ("specific_improvements", lambda: ["Attempted Korean speaking practice"]),
+    ("remaining_issues", lambda: ["Focus on speaking longer (60+ seconds) with more details and address both topics"]),
+    ("feedback_application", lambda: "unknown"),
+    ("overall_assessment", lambda: "Keep practicing! Focus on speaking for 60+ seconds with personal details and clear reasons for both topics."),
+    ("encouragement_message", lambda: "Every practice session makes you better! Keep going!"),
+)
+
+# 점수 필드 (필드, 1-10 범위를 벗어날 때 기본값)
+_IMPROVEMENT_SCORE_FIELDS = (
+    ("first_attempt_score", 5),
+    ("second_attempt_score", 5),
+    ("improvement_score", 5),
+)
+
+# 리스트 필드 (필드, 리스트가 아니거나 비어 있을 때 기본 항목)
+_IMPROVEMENT_LIST_FIELDS = (
+    ("specific_improvements", ("Attempted Korean speaking practice",)),
+    ("remaining_issues", ("Continue practicing for better fluency",)),
+)
+
+_VALID_FEEDBACK_APPLICATIONS = ("excellent", "good", "partial", "poor", "unclear")
+
+
 def validate_and_fix_improvement(improvement):
     """개선도 평가를 검증하고 누락된 필수 필드를 추가 (2인칭 톤)"""
-    required_fields = {
-        "first_attempt_score": 5,
-        "second_attempt_score": 5,
-        "score_difference": 0,
-        "improvement_score": 5,
-        "improvement_reason": "Continue practicing for better fluency and accuracy",
-        "specific_improvements": ["Attempted Korean speaking practice"],
-        "remaining_issues": ["Focus on speaking longer (60+ seconds) with more details and address both topics"],
-        "feedback_application": "unknown",
-        "overall_assessment": "Keep practicing! Focus on speaking for 60+ seconds with personal details and clear reasons for both topics.",
-        "encouragement_message": "Every practice session makes you better! Keep going!"
-    }
-    
-    improvement = ensure_required_fields(improvement, required_fields)
+    improvement = ensure_required_field_factories(improvement, _IMPROVEMENT_REQUIRED_FIELDS)
     
     # 점수들 검증 (1-10 범위)
-    score_fields = ["first_attempt_score", "second_attempt_score", "improvement_score"]
-    for field in score_fields:
-        score = improvement.get(field, 5)
-        if not isinstance(score, (int, float)) or score < 1 or score > 10:
-            improvement[field] = 5
+    for field, default in _IMPROVEMENT_SCORE_FIELDS:
+        score = improvement.get(field, default)
+        improvement[field] = score if isinstance(score, (int, float)) and 1 <= score <= 10 else default
     
-    # score_difference 계산
-    try:
-        improvement["score_difference"] = improvement["second_attempt_score"] - improvement["first_attempt_score"]
-    except:
-        improvement["score_difference"] = 0
+    # score_difference 계산 (위에서 두 점수 모두 숫자로 검증됨)
+    improvement["score_difference"] = improvement["second_attempt_score"] - improvement["first_attempt_score"]
     
     # 리스트 필드들 검증
-    list_fields = ["specific_improvements", "remaining_issues"]
-    for field in list_fields:
+    for field, default_items in _IMPROVEMENT_LIST_FIELDS:
         if not isinstance(improvement.get(field), list) or not improvement[field]:
-            improvement[field] = ["Attempted Korean speaking practice"] if field == "specific_improvements" else ["Continue practicing for better fluency"]
+            improvement[field] = list(default_items)
     
     # feedback_application 검증
-    valid_applications = ["excellent", "good", "partial", "poor", "unclear"]
-    if improvement.get("feedback_application") not in valid_applications:
+    if improvement.get("feedback_application") not in _VALID_FEEDBACK_APPLICATIONS:
         improvement["feedback_application"] = "unclear"
     
     return improvement
@@ -995,75 +1884,60 @@ def get_fallback_improvement_assessment():
     }
 
 
-def get_score_category_info(score):
-    """점수에 따른 카테고리 정보 반환"""
+def _lookup_score_category(score):
+    """STT_RUBRIC 구간을 순서대로 검사해 카테고리 정보 반환 (해당 없으면 fair)"""
     for category, info in STT_RUBRIC.items():
         if info["min_score"] <= score <= info["max_score"]:
             return info
     return STT_RUBRIC["fair"]
 
 
+# 0~10 정수 점수별 카테고리 정보 (매 rerun마다 루브릭을 순회하지 않도록 미리 계산)
+_SCORE_CATEGORY_TABLE = tuple(_lookup_score_category(i) for i in range(11))
+_SCORE_CATEGORY_TABLE_INDEX = frozenset(range(11))
+
+
+def get_score_category_info(score):
+    """점수에 따른 카테고리 정보 반환"""
+    # 🔥 정수 점수는 표에서 바로 조회, 소수점 점수만 구간 검사
+    if score in _SCORE_CATEGORY_TABLE_INDEX:
+        return _SCORE_CATEGORY_TABLE[int(score)]
+    return _lookup_score_category(score)
+
+
+# 점수 + 카테고리 HTML 템플릿
+_CATEGORY_SCORE_HTML = (
+    "<h2 style='color: {color}; text-align: center;'>{score}/10</h2>"
+    "<p style='color: {color}; text-align: center; font-weight: bold;'>{label}</p>"
+)
+
+
 def display_score_with_category(score, label="Score"):
     """점수를 카테고리와 함께 표시"""
     if isinstance(score, (int, float)):
         category_info = get_score_category_info(score)
+        # 🔥 점수 + 카테고리를 한 번의 st.markdown으로 전송 (rerun마다 프론트엔드 delta 1개)
         st.markdown(
-            f"<h2 style='color: {category_info['color']}; text-align: center;'>{score}/10</h2>", 
-            unsafe_allow_html=True
-        )
-        st.markdown(
-            f"<p style='color: {category_info['color']}; text-align: center; font-weight: bold;'>{category_info['label']}</p>", 
+            _CATEGORY_SCORE_HTML.format(color=category_info['color'], score=score, label=category_info['label']),
             unsafe_allow_html=True
         )
     else:
         st.write(f"**{label}:** {score}")
 
 
-def display_score_with_encouragement(score, duration=0):
-    """점수를 격려 메시지와 함께 표시 (60-120초 기준)"""
-    category_info = get_score_category_info(score)
-    
-    # 점수 표시
-    st.markdown(
-        f"<h2 style='color: {category_info['color']}; text-align: center; margin: 20px 0;'>{score}/10</h2>", 
-        unsafe_allow_html=True
-    )
-    
-    # 🔥 격려 메시지 (TOPIK 기준으로 수정, 60-120초 목표)
-    if score >= 8:
-        st.balloons()
-        message = "🌟 Outstanding! Excellent task completion with rich content!"
-        if duration >= 90:
-            message += " Perfect length too!"
-    elif score >= 7:
-        message = "🎯 Great job! Good task completion and content!"
-        if duration < 60:
-            message += " Try to speak for at least 60 seconds next time."
-    elif score >= 6:
-        message = "💪 Good work! You're improving steadily!"
-        if duration < 60:
-            message += " Aim for 60+ seconds."
-    elif score >= 5:
-        message = "🚀 Keep going! You're learning!"
-        if duration < 60:
-            message += " Focus on reaching 60 seconds."
-    else:
-        message = "🌱 Everyone starts somewhere! Keep practicing!"
-        message += " Work towards 60+ seconds with both topics covered."
-    
-    # 메시지 표시
-    st.markdown(
-        f"""
+# 점수/격려 메시지 HTML 템플릿 (rerun마다 큰 f-string을 새로 만들지 않고 format만 수행)
+_ENCOURAGE_SCORE_HTML = "<h2 style='color: {color}; text-align: center; margin: 20px 0;'>{score}/10</h2>"
+_ENCOURAGE_HTML = """
         <div style='
-            background-color: {category_info['color']}20;
-            border: 2px solid {category_info['color']};
+            background-color: {color}20;
+            border: 2px solid {color};
             border-radius: 10px;
             padding: 15px;
             text-align: center;
             margin: 10px 0;
         '>
             <p style='
-                color: {category_info['color']};
+                color: {color};
                 font-weight: bold;
                 font-size: 16px;
                 margin: 0;
@@ -1071,7 +1945,38 @@ def display_score_with_encouragement(score, duration=0):
                 {message}
             </p>
         </div>
-        """,
+        """
+
+
+# 점수 구간별 격려 메시지 (경계값 이상이면 위 구간) - (메시지, 60초 미만 추가 문구, 90초 이상 추가 문구)
+_ENCOURAGE_SCORE_THRESHOLDS = (5, 6, 7, 8)
+_ENCOURAGE_MESSAGES = (
+    ("🌱 Everyone starts somewhere! Keep practicing! Work towards 60+ seconds with both topics covered.", "", ""),
+    ("🚀 Keep going! You're learning!", " Focus on reaching 60 seconds.", ""),
+    ("💪 Good work! You're improving steadily!", " Aim for 60+ seconds.", ""),
+    ("🎯 Great job! Good task completion and content!", " Try to speak for at least 60 seconds next time.", ""),
+    ("🌟 Outstanding! Excellent task completion with rich content!", "", " Perfect length too!"),
+)
+
+
+def display_score_with_encouragement(score, duration=0):
+    """점수를 격려 메시지와 함께 표시 (60-120초 기준)"""
+    category_info = get_score_category_info(score)
+    
+    # 🔥 격려 메시지 (TOPIK 기준으로 수정, 60-120초 목표)
+    band = bisect.bisect_right(_ENCOURAGE_SCORE_THRESHOLDS, score)
+    message, short_suffix, long_suffix = _ENCOURAGE_MESSAGES[band]
+    if band == len(_ENCOURAGE_SCORE_THRESHOLDS):
+        st.balloons()
+    if duration < 60:
+        message += short_suffix
+    elif duration >= 90:
+        message += long_suffix
+    
+    # 🔥 점수 + 메시지를 한 번의 st.markdown으로 표시 (rerun마다 프론트엔드 delta 1개)
+    st.markdown(
+        _ENCOURAGE_SCORE_HTML.format(color=category_info['color'], score=score)
+        + _ENCOURAGE_HTML.format(color=category_info['color'], message=message),
         unsafe_allow_html=True
     )
 
@@ -1128,8 +2033,8 @@ def count_grammar_errors(grammar_issues):
     valid_errors = 0
     for issue in grammar_issues:
         if isinstance(issue, str) and '|' in issue:
-            # "error_type|original|fix|explanation" 형식 검증
-            parts = issue.split('|')
+            # "error_type|original|fix|explanation" 형식 검증 (설명 부분은 나누지 않음)
+            parts = issue.split('|', 3)
             if len(parts) >= 3 and parts[1].strip() and parts[2].strip():
                 valid_errors += 1
     return valid_errors
@@ -1159,8 +2064,16 @@ def get_research_scores(transcript, grammar_issues, duration_s):
     if not duration_s or not isinstance(duration_s, (int, float)):
         duration_s = 0.0
     
-    # 단어 수 계산 (공백 기준)
-    total_words = len(transcript.split()) if transcript.strip() else 0
+    # 🔥 같은 입력(재렌더링/재시도)은 메모이즈된 결과의 복사본 반환 (문자열 이슈만 오류 수에 반영)
+    issues_key = tuple(issue for issue in grammar_issues if isinstance(issue, str))
+    return dict(_compute_research_scores(transcript, issues_key, round(duration_s, 1)))
+
+
+@lru_cache(maxsize=256)
+def _compute_research_scores(transcript, grammar_issues, duration_s):
+    """get_research_scores 계산 본체 (정규화된 해시 가능한 인자만 받음)"""
+    # 단어 수 계산 (공백 기준, 공백뿐인 문자열은 split()이 빈 리스트 반환)
+    total_words = len(transcript.split())
     
     # 실제 문법 오류 개수 계산
     error_count = count_grammar_errors(grammar_issues)
@@ -1182,7 +2095,7 @@ def get_research_scores(transcript, grammar_issues, duration_s):
         "fluency_score": round(fluency_score, 1),
         "error_rate": round(error_rate, 2),
         "word_count": total_words,
-        "duration_s": round(duration_s, 1),
+        "duration_s": duration_s,
         "error_count": error_count
     }
 
@@ -1195,7 +2108,7 @@ def get_student_feedback(transcript, research_scores, original_feedback):
     Args:
         transcript: STT 전사 텍스트
         research_scores: 연구용 점수 데이터
-        original_feedback: GPT가 생성한 원본 피드백
+        original_feedback: GPT가 생성한 원본 피드백 (이 함수가 소유권을 넘겨받아 직접 수정)
         
     Returns:
         dict: 학생용 피드백 데이터 (원본 GPT 피드백 유지)
@@ -1218,19 +2131,18 @@ def get_student_feedback(transcript, research_scores, original_feedback):
     # 연구용 점수는 이미 st.session_state.research_scores에 저장되어 있음
     
     # 원본 피드백 그대로 사용 (GPT가 생성한 교육적 피드백 유지)
-    student_feedback = original_feedback.copy()
+    # 🔥 호출부(get_gpt_feedback)는 원본을 다시 쓰지 않으므로 복사 없이 그대로 확장
+    student_feedback = original_feedback
     
     # 연구용 메타데이터만 추가 (학생에게는 보이지 않음)
-    student_feedback.update({
-        "_research_metadata": {
-            "accuracy_score": research_scores.get("accuracy_score", 0),
-            "fluency_score": research_scores.get("fluency_score", 0),
-            "error_rate": research_scores.get("error_rate", 0),
-            "word_count": research_scores.get("word_count", 0),
-            "duration_s": research_scores.get("duration_s", 0),
-            "dual_evaluation_applied": True
-        }
-    })
+    student_feedback["_research_metadata"] = {
+        "accuracy_score": research_scores.get("accuracy_score", 0),
+        "fluency_score": research_scores.get("fluency_score", 0),
+        "error_rate": research_scores.get("error_rate", 0),
+        "word_count": research_scores.get("word_count", 0),
+        "duration_s": research_scores.get("duration_s", 0),
+        "dual_evaluation_applied": True
+    }
     
     return student_feedback
 
@@ -738,7 +738,7 @@ def save_and_backup_data():
         st.session_state.saved_timestamp = timestamp
         
         # 🔥 GCS 자동 업로드 (참고용 엑셀 파일도 포함)
-        uploaded_files, errors = auto_backup_to_gcs(
+        uploaded_files, errors, mapping_status = auto_backup_to_gcs(
             csv_filename, reference_excel_filename, zip_filename, 
             st.session_state.session_id, 
             timestamp  # 새로 생성하지 않고 기존 timestamp 사용
@@ -750,7 +750,8 @@ def save_and_backup_data():
             timestamp,  # 같은 timestamp 사용
             uploaded_files,
             errors,
-            False
+            False,
+            mapping_status
         )
         
         # 업로드 결과 표시
@@ -5,10 +5,14 @@ TOPIK 말하기 기준 연구용 점수 계산 및 채점 보조 데이터 생
 
 import re
 import json
+from functools import lru_cache
 from datetime import datetime
 import streamlit as st
 from config import EXPERIMENT_QUESTION, CURRENT_SESSION
 
+# 한국어 문장 구분자: ., !, ?, 요/어요/습니다 뒤의 공백 (모듈 로드 시 한 번만 컴파일)
+_KOREAN_SENT_SPLIT = re.compile(r'([.!?]|(?:요|어요|습니다|세요|해요|이에요|예요)\s*)')
+
 
 # === TOPIK 3영역 자동 점수 계산 함수들 ===
 
@@ -527,6 +531,7 @@ def calculate_speech_consistency(transcript):
 
 # === 보조 함수들 ===
 
+@lru_cache(maxsize=64)
 def split_korean_sentences(text):
     """
     한국어 문장 분할
@@ -535,22 +540,15 @@ def split_korean_sentences(text):
         text: 분할할 텍스트
         
     Returns:
-        list: 분할된 문장들
+        tuple: 분할된 문장들 (같은 텍스트는 캐시된 결과를 공유하므로 읽기 전용)
     """
-    pattern = r'([.!?]|(?:요|어요|습니다|세요|해요|이에요|예요)\s*)'
-    sentences = re.split(pattern, text)
-    
-    result = []
-    for i in range(0, len(sentences)-1, 2):
-        if i+1 < len(sentences):
-            sentence = sentences[i] + sentences[i+1]
-            if sentence.strip():
-                result.append(sentence.strip())
+    sentences = _KOREAN_SENT_SPLIT.split(text)
     
-    if len(sentences) % 2 == 1 and sentences[-1].strip():
-        result.append(sentences[-1].strip())
+    pieces = [body + ending for body, ending in zip(sentences[0::2], sentences[1::2])]
+    if len(sentences) % 2 == 1:
+        pieces.append(sentences[-1])
     
-    return [s for s in result if len(s.strip()) > 3]
+    return tuple(s for s in map(str.strip, pieces) if len(s) > 3)
 
 
 def extract_specific_details(transcript):
@@ -0,0 +1,329 @@
+"""
+test_feedback.py
+feedback.py 단위 테스트 (API 호출 없음)
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import feedback
+
+
+GOOD_MINI_RESPONSE = json.dumps({
+    "suggested_model_sentence": "지난 방학에는 가족과 함께 부산에 갔어요.",
+    "grammar_issues": [
+        "❗️ Particle\n• Original: '학교를 가요' → Fix: '학교에 가요'\n🧠 Simple explanation: Use '에' for destination",
+        "❗️ Tense\n• Original: '어제 가요' → Fix: '어제 갔어요'\n🧠 Simple explanation: Use past tense with '어제'"
+    ],
+    "interview_readiness_score": 7
+}, ensure_ascii=False)
+
+MALFORMED_MINI_RESPONSE = json.dumps({
+    "suggested_model_sentence": "지난 방학에는 가족과 함께 부산에 갔어요.",
+    "grammar_issues": [
+        "Particle: you should use a different particle here"
+    ],
+    "interview_readiness_score": 12
+}, ensure_ascii=False)
+
+
+def test_good_mini_response_is_confident():
+    parsed = feedback.parse_gpt_response(GOOD_MINI_RESPONSE)
+
+    assert parsed["grammar_issues"][0].startswith("Particle|학교를 가요|학교에 가요|")
+    assert feedback._is_confident_feedback(GOOD_MINI_RESPONSE)
+
+
+def test_malformed_mini_response_is_escalated():
+    parsed = feedback.parse_gpt_response(MALFORMED_MINI_RESPONSE)
+
+    # 검증 후에는 점수/이슈가 기본값으로 보정되므로 원문 기준으로만 판단 가능
+    assert parsed["interview_readiness_score"] == 6
+    assert not feedback._is_confident_feedback(MALFORMED_MINI_RESPONSE)
+
+
+def test_malformed_issue_alone_is_escalated():
+    response = json.loads(MALFORMED_MINI_RESPONSE)
+    response["interview_readiness_score"] = 7
+
+    assert not feedback._is_confident_feedback(json.dumps(response, ensure_ascii=False))
+
+
+def test_invalid_json_is_not_confident():
+    assert not feedback._is_confident_feedback("not json")
+
+
+def test_transcript_cache_key_ignores_punctuation_but_not_duration():
+    key = feedback._feedback_transcript_cache_key
+
+    assert key("gpt-4o", "저는 학생이에요. 좋아요!", 71.0) == key("gpt-4o", "저는  학생이에요 좋아요", 71.0)
+    assert key("gpt-4o", "저는 학생이에요", 71.0) != key("gpt-4o", "저는 학생이에요", 79.0)
+
+
+def test_response_cache_evicts_oldest_and_expired(monkeypatch):
+    monkeypatch.setattr(feedback, "_RESPONSE_CACHE", feedback.OrderedDict())
+    monkeypatch.setattr(feedback, "RESPONSE_CACHE_MAX_ENTRIES", 2)
+
+    feedback._store_cached_response("a", "1", 0.1)
+    feedback._store_cached_response("b", "2", 0.1)
+    feedback._store_cached_response("c", "3", 0.1)
+    assert list(feedback._RESPONSE_CACHE) == ["b", "c"]
+
+    feedback._RESPONSE_CACHE["b"] = ("2", 0)  # 만료된 항목
+    feedback._store_cached_response("c", "3", 0.1)
+    assert list(feedback._RESPONSE_CACHE) == ["c"]
+
+
+def test_json_object_closed_ignores_braces_and_escaped_quotes_in_strings():
+    state = {'depth': 0, 'in_string': False, 'escaped': False}
+    chunks = ['{"a": "}{ \\"', '}\\\\", "b": {"c"', ': "x}"}', ' }', ' trailing']
+
+    closed_at = [feedback._json_object_closed(chunk, state) for chunk in chunks[:4]]
+
+    assert closed_at == [False, False, False, True]
+
+
+def test_json_object_closed_stays_open_on_truncated_response():
+    state = {'depth': 0, 'in_string': False, 'escaped': False}
+
+    assert not feedback._json_object_closed('{"a": {"b": "text with } and \\" inside', state)
+    assert state['depth'] == 2 and state['in_string']
+
+
+class FakeStream:
+    """청크를 돌려주는 가짜 스트리밍 응답 (silent=True면 close()될 때까지 아무것도 보내지 않음)"""
+
+    def __init__(self, text="", silent=False):
+        self.text = text
+        self.silent = silent
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        if self.silent:
+            self.closed.wait(5)
+            return
+        for ch in self.text:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=ch))])
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeClient:
+    """chat.completions.create 호출마다 responses의 다음 항목을 반환 (예외면 raise)"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _stream(client, **kwargs):
+    kwargs.setdefault("hedge_delay", 0.2)
+    kwargs.setdefault("first_token_timeout", 0.6)
+    return feedback.stream_chat_completion(client, total_timeout=5, model="gpt-4o", messages=[], **kwargs)
+
+
+def test_stream_fast_first_request_is_not_hedged():
+    client = FakeClient(FakeStream('{"a": 1}'))
+
+    assert _stream(client, hedge_delay=2, first_token_timeout=3) == '{"a": 1}'
+    assert len(client.calls) == 1
+
+
+def test_stream_hedge_wins_and_slow_request_is_closed():
+    slow = FakeStream(silent=True)
+    client = FakeClient(slow, FakeStream('{"a": 2}'))
+
+    assert _stream(client) == '{"a": 2}'
+    assert len(client.calls) == 2
+    assert slow.closed.wait(1)
+
+
+def test_stream_both_silent_raises_timeout():
+    streams = [FakeStream(silent=True), FakeStream(silent=True)]
+    client = FakeClient(*streams)
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        _stream(client)
+    assert time.monotonic() - started < 3
+    assert all(stream.closed.wait(1) for stream in streams)
+
+
+def test_stream_fast_api_error_does_not_hang():
+    client = FakeClient(RuntimeError("invalid request"))
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="invalid request"):
+        _stream(client)
+    assert time.monotonic() - started < 1
+    assert len(client.calls) == 1
+
+
+def test_improvement_request_is_sent_as_built_and_retried_on_first_token_timeout(monkeypatch):
+    request = feedback.build_improvement_request("첫 답변", "두 번째 답변", {"grammar_issues": []})
+    calls = []
+
+    def fake_stream(client, total_timeout, **kwargs):
+        calls.append((total_timeout, kwargs))
+        if len(calls) == 1:
+            raise feedback.FirstTokenTimeout("no token")
+        return '{"improvement_score": 7}'
+
+    monkeypatch.setattr(feedback, "stream_chat_completion", fake_stream)
+    monkeypatch.setattr(feedback, "IMPROVEMENT_RETRY_BASE_DELAY", 0.01)
+
+    assert feedback._request_improvement_with_backoff(request) == '{"improvement_score": 7}'
+    assert len(calls) == 2
+    assert calls[0][1] == request
+    assert calls[1][0] < calls[0][0] <= feedback.IMPROVEMENT_TIMEOUT
+
+
+def test_improvement_total_timeout_is_not_retried(monkeypatch):
+    calls = []
+
+    def fake_stream(client, total_timeout, **kwargs):
+        calls.append(total_timeout)
+        raise TimeoutError("Response not completed")
+
+    monkeypatch.setattr(feedback, "stream_chat_completion", fake_stream)
+
+    with pytest.raises(TimeoutError):
+        feedback._request_improvement_with_backoff({"model": "gpt-4o", "messages": []})
+    assert len(calls) == 1
+
+
+def test_improvement_retries_stop_at_the_total_budget(monkeypatch):
+    calls = []
+
+    def fake_stream(client, total_timeout, **kwargs):
+        calls.append(total_timeout)
+        raise feedback.FirstTokenTimeout("no token")
+
+    monkeypatch.setattr(feedback, "stream_chat_completion", fake_stream)
+    monkeypatch.setattr(feedback, "IMPROVEMENT_TIMEOUT", 0.3)
+    monkeypatch.setattr(feedback, "IMPROVEMENT_RETRY_BASE_DELAY", 0.5)
+
+    started = time.monotonic()
+    with pytest.raises(feedback.FirstTokenTimeout):
+        feedback._request_improvement_with_backoff({"model": "gpt-4o", "messages": []})
+    assert len(calls) == 1
+    assert time.monotonic() - started < 0.3
+
+
+def test_feedback_retry_uses_configured_model_and_records_it(monkeypatch):
+    models = []
+
+    def fake_stream(client, **kwargs):
+        models.append(kwargs["model"])
+        if len(models) == 1:
+            raise TimeoutError("Response not completed")
+        return GOOD_MINI_RESPONSE
+
+    monkeypatch.setattr(feedback, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(feedback, "_get_openai_client", lambda: object())
+    monkeypatch.setattr(feedback, "_RESPONSE_CACHE", feedback.OrderedDict())
+    monkeypatch.setattr(feedback, "GPT_FEEDBACK_MINI_FIRST", False)
+    monkeypatch.setattr(feedback, "GPT_FEEDBACK_RETRY_MODEL", "gpt-4o")
+    monkeypatch.setattr(feedback, "stream_chat_completion", fake_stream)
+
+    feedback.get_gpt_feedback("지난 방학에 부산에 갔어요. 다음 방학에는 한국어를 공부할 거예요.", duration=65.0)
+
+    assert models == ["gpt-4o", "gpt-4o"]
+    assert feedback.st.session_state.gpt_debug_info["model_used"] == "gpt-4o"
+
+
+class FakeBatchClient:
+    """Batch API(files/batches) 가짜 클라이언트 - 제출한 JSONL을 보관하고 완료 결과를 돌려줌"""
+
+    def __init__(self, fail_submit=False):
+        self.fail_submit = fail_submit
+        self.uploaded = None
+        self.status = "in_progress"
+        self.output = ""
+        self.files = SimpleNamespace(create=self.create_file, content=self.file_content)
+        self.batches = SimpleNamespace(create=self.create_batch, retrieve=self.retrieve_batch)
+
+    def create_file(self, file, purpose):
+        if self.fail_submit:
+            raise RuntimeError("upload failed")
+        self.uploaded = file[1].decode("utf-8")
+        return SimpleNamespace(id="file-in")
+
+    def create_batch(self, **kwargs):
+        return SimpleNamespace(id="batch-1")
+
+    def retrieve_batch(self, batch_id):
+        done = self.status == "completed"
+        return SimpleNamespace(status=self.status, output_file_id="file-out" if done else None)
+
+    def file_content(self, file_id):
+        return SimpleNamespace(text=self.output)
+
+
+def _batch_output_line(custom_id, content, status_code=200):
+    body = {"choices": [{"message": {"content": content}}]} if content else {}
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+
+def test_feedback_batch_round_trip(monkeypatch):
+    client = FakeBatchClient()
+    monkeypatch.setattr(feedback, "_get_openai_client", lambda: client)
+    monkeypatch.setattr(feedback, "_RESPONSE_CACHE", feedback.OrderedDict())
+    items = [("s1", "지난 방학에 부산에 갔어요.", 65.0), ("s2", "다음 방학에 공부할 거예요.", 70.0)]
+
+    batch_id = feedback.submit_feedback_batch(items)
+
+    assert batch_id == "batch-1"
+    assert [json.loads(line)["custom_id"] for line in client.uploaded.splitlines()] == ["s1", "s2"]
+    assert feedback.collect_feedback_batch(batch_id, items) is None  # 아직 처리 중
+
+    client.status = "completed"
+    client.output = "\n".join([_batch_output_line("s1", GOOD_MINI_RESPONSE), _batch_output_line("s2", None, 500)])
+    results = feedback.collect_feedback_batch(batch_id, items)
+
+    assert results["s1"]["feedback"]["suggested_model_sentence"]
+    assert results["s2"]["feedback"] is None
+    assert "accuracy_score" in results["s2"]["research_scores"]
+    # 성공한 응답은 실시간 경로와 같은 키로 캐시됨
+    assert len(feedback._RESPONSE_CACHE) == 1
+
+
+def test_feedback_batch_submit_failure_returns_none(monkeypatch):
+    monkeypatch.setattr(feedback, "_get_openai_client", lambda: FakeBatchClient(fail_submit=True))
+
+    assert feedback.submit_feedback_batch([("s1", "지난 방학에 부산에 갔어요.", 65.0)]) is None
+
+
+def test_grouped_feedback_handles_missing_and_malformed_items(monkeypatch):
+    content = json.dumps({"s1": json.loads(GOOD_MINI_RESPONSE), "s2": "not a dict"}, ensure_ascii=False)
+    response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    monkeypatch.setattr(feedback, "_get_openai_client", lambda: FakeClient(response))
+    items = [("s1", "지난 방학에 부산에 갔어요.", 65.0), ("s2", "공부할 거예요.", 70.0), ("s3", "좋아요.", 30.0)]
+
+    results = feedback.get_gpt_feedback_batch(items)
+
+    assert results["s1"]["feedback"]["_research_metadata"]["dual_evaluation_applied"]
+    assert results["s2"]["feedback"] is None  # dict가 아닌 항목
+    assert results["s3"]["feedback"] is None  # 응답에 없는 id
+    assert all("accuracy_score" in result["research_scores"] for result in results.values())
+
+
+def test_grouped_feedback_request_failure_gives_no_feedback(monkeypatch):
+    monkeypatch.setattr(feedback, "_get_openai_client", lambda: FakeClient(RuntimeError("server error")))
+
+    results = feedback.get_gpt_feedback_batch([("s1", "지난 방학에 부산에 갔어요.", 65.0)])
+
+    assert results["s1"]["feedback"] is None
@@ -3,6 +3,8 @@ tts.py
 ElevenLabs를 이용한 텍스트-음성 변환 및 오디오 재생 모듈 (2025 최신 API 호환 버전 - 억양 문제 해결)
 """
 
+import os
+import logging
 import streamlit as st
 import re
 from config import (
@@ -12,6 +14,12 @@ from config import (
     TTS_SETTINGS
 )
 
+# TTS 호출별 상세 로그는 KLEX_DEBUG=1일 때만 출력 (평소에는 포맷팅/출력 비용 없음)
+logger = logging.getLogger(__name__)
+if os.environ.get("KLEX_DEBUG") == "1":
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(logging.StreamHandler())
+
 
 def fix_tts_sentence_punctuation(text):
     """
@@ -94,12 +102,13 @@ def synthesize_audio(text, speed="normal"):
         text = fix_tts_sentence_punctuation(text)
         
         # 🔥 속도와 관계없이 원본 텍스트 그대로 사용 (텍스트 포맷팅 제거)
-        print(f"{speed.capitalize()} speed text: {text}")
-        
-        print("Starting TTS generation...")
-        print("Text:", text[:100] + "..." if len(text) > 100 else text)
-        print("Voice ID:", ELEVEN_VOICE_ID)
-        print("Speed:", speed)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("%s speed text: %s", speed.capitalize(), text)
+            logger.debug("Starting TTS generation...")
+            logger.debug("Text: %s", text[:100] + "..." if len(text) > 100 else text)
+            logger.debug("Voice ID: %s", ELEVEN_VOICE_ID)
+            logger.debug("Speed: %s", speed)
         
         # 🎯 config.py의 TTS_SETTINGS를 그대로 사용 (하드코딩 제거)
         voice_settings = TTS_SETTINGS.get(speed, TTS_SETTINGS["normal"]).copy()
@@ -115,8 +124,9 @@ def synthesize_audio(text, speed="normal"):
             "optimize_streaming_latency": 1,   # 지연시간 최적화 (0-4)
         }
         
-        print(f"Voice settings ({speed}) - Korean Intonation Fixed:", voice_settings)
-        print(f"Generation params: {list(generation_params.keys())}")
+        if debug:
+            logger.debug("Voice settings (%s) - Korean Intonation Fixed: %s", speed, voice_settings)
+            logger.debug("Generation params: %s", list(generation_params))
         
         # 2025 최신 API 호출 방식
         try:
@@ -141,7 +151,7 @@ def synthesize_audio(text, speed="normal"):
             audio_data = b"".join(audio_generator)
         
         if audio_data:
-            print(f"TTS Success ({speed})! Audio length:", len(audio_data))
+            logger.debug("TTS Success (%s)! Audio length: %d", speed, len(audio_data))
             return audio_data
         else:
             print("No audio data received")
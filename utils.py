@@ -12,6 +12,18 @@ import re
 from config import EXPERIMENT_STEPS, SUPPORTED_AUDIO_FORMATS, UI_COLORS, EXPERIMENT_QUESTION, AUDIO_QUALITY
 
 
+# === 피드백 포맷팅 정규식 (모듈 로드 시 한 번만 컴파일 - rerun마다 re 캐시 조회 생략) ===
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_EXTRA_BREAKS_RE = re.compile(r'(<br>\s*){3,}')
+# 패턴: 💬 Topic: [토픽명] 🔍 Example: [한국어] '[영어]'
+_CONTENT_IDEA_RE = re.compile(r'💬\s*Topic:\s*(.*?)<br>🔍\s*Example:\s*(.*?)<br>\s*\'(.*?)\'')
+# 패턴: 🚀 Try: / 🚀 Try this: '[패턴]' = '[의미]' 🔍 Example: '[예시]' 💡 When to use: [설명]
+_ADVANCED_PATTERN_RE = re.compile(r'🚀\s*Try(?: this)?:\s*(.*?)<br>🔍\s*Example:\s*(.*?)<br>💡\s*When to use:\s*(.*?)(?=<br>|$)')
+_SINGLE_QUOTED_RE = re.compile(r"'([^']+)'")
+_DOUBLE_QUOTED_RE = re.compile(r'"([^"]+)"')
+_TRANSLATION_LINE_RE = re.compile(r"<br>\s*'(.*?)'")
+
+
 def convert_student_to_you(text):
     """
     텍스트에서 'the student' → 'you', 'The student' → 'You', 'their' → 'your'로 변환
@@ -713,10 +725,10 @@ def format_feedback_content(content):
     formatted = formatted.replace('🚀', '<span style="color: #3b82f6;">🚀</span>')
     
     # **굵은 글씨** 처리 (나이트 모드 최적화)
-    formatted = re.sub(r'\*\*(.*?)\*\*', r'<strong style="color: inherit; font-weight: bold;">\1</strong>', formatted)
+    formatted = _BOLD_RE.sub(r'<strong style="color: inherit; font-weight: bold;">\1</strong>', formatted)
     
     # 중복 줄바꿈 정리
-    formatted = re.sub(r'(<br>\s*){3,}', '<br><br>', formatted)
+    formatted = _EXTRA_BREAKS_RE.sub('<br><br>', formatted)
     
     return formatted
 
@@ -936,8 +948,6 @@ def format_content_ideas(content):
     # 결과: 💬 **[토픽명]** 🔍 [한국어] *'[영어]'*
     
     # Content Ideas 패턴 매칭 및 변환
-    content_pattern = r'💬\s*Topic:\s*(.*?)<br>🔍\s*Example:\s*(.*?)<br>\s*\'(.*?)\''
-    
     def replace_content_format(match):
         topic = match.group(1).strip()
         korean_example = match.group(2).strip()
@@ -945,34 +955,29 @@ def format_content_ideas(content):
         
         return f'💬 **{topic}**<br>🔍 {korean_example}<br><span style="margin-left:20px; color: inherit; opacity: 0.7; font-style:italic;">*\'{english_translation}\'*</span>'
     
-    formatted = re.sub(content_pattern, replace_content_format, formatted)
+    formatted = _CONTENT_IDEA_RE.sub(replace_content_format, formatted)
     
     # === Advanced Grammar Pattern 포맷 처리 ===
     # 패턴: 🚀 Try this: '[패턴]' = '[의미]' 🔍 Example: '[예시]' 💡 When to use: [설명]
     # 결과: 🚀 Try this: **'[패턴]'** = '[의미]' 🔍 '[예시]' 💡 [설명]
     
-    # Advanced Pattern 포맷 개선
-    advanced_pattern1 = r'🚀\s*Try:\s*(.*?)<br>🔍\s*Example:\s*(.*?)<br>💡\s*When to use:\s*(.*?)(?=<br>|$)'
-    advanced_pattern2 = r'🚀\s*Try this:\s*(.*?)<br>🔍\s*Example:\s*(.*?)<br>💡\s*When to use:\s*(.*?)(?=<br>|$)'
-    
+    # Advanced Pattern 포맷 개선 ("Try:" / "Try this:" 두 형식을 한 번에 처리)
     def replace_advanced_format(match):
         pattern_desc = match.group(1).strip()
         example = match.group(2).strip()
         usage = match.group(3).strip()
         
         # 패턴 부분에서 큰따옴표나 작은따옴표로 감싸진 부분을 굵게 만들기
-        pattern_desc = re.sub(r"'([^']+)'", r"**'\1'**", pattern_desc)
-        pattern_desc = re.sub(r'"([^"]+)"', r'**"\1"**', pattern_desc)
+        pattern_desc = _SINGLE_QUOTED_RE.sub(r"**'\1'**", pattern_desc)
+        pattern_desc = _DOUBLE_QUOTED_RE.sub(r'**"\1"**', pattern_desc)
         
         return f'🚀 Try this: {pattern_desc}<br>🔍 {example}<br>💡 {usage}'
     
-    formatted = re.sub(advanced_pattern1, replace_advanced_format, formatted)
-    formatted = re.sub(advanced_pattern2, replace_advanced_format, formatted)
+    formatted = _ADVANCED_PATTERN_RE.sub(replace_advanced_format, formatted)
     
     # === 기존 포맷 처리 (fallback) ===
     # 영어 번역 줄: '…' 만 골라 들여쓰기 + 이탤릭 처리 (나이트 모드 최적화)
-    formatted = re.sub(
-        r"<br>\s*'(.*?)'",
+    formatted = _TRANSLATION_LINE_RE.sub(
         r"<br><span style='margin-left:20px; color: inherit; opacity: 0.7; font-style:italic;'>'\g<1>'</span>",
         formatted
     )